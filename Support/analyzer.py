@@ -11,12 +11,16 @@ SCRIPT_ROOT = Path(__file__).resolve().parent
 if str(SCRIPT_ROOT) not in sys.path:
     sys.path.insert(0, str(SCRIPT_ROOT))
 
-from analyzer_core import AnalyzerPipeline, load_manifest
+from analyzer_core import AnalyzerPipeline
+
+try:  # Optional fast serializer; stdlib json remains the fallback.
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
 
 
 def _build_pipeline() -> AnalyzerPipeline:
-    manifest = load_manifest(SCRIPT_ROOT)
-    return AnalyzerPipeline(manifest, base_path=SCRIPT_ROOT)
+    return AnalyzerPipeline.load_cached(base_path=SCRIPT_ROOT)
 
 
 def main() -> int:
@@ -34,7 +38,10 @@ def main() -> int:
         sys.stderr.write(str(exc))
         return 1
 
-    sys.stdout.write(json.dumps(result))
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        sys.stdout.write(json.dumps(result))
     return 0
 
 
@@ -0,0 +1,42 @@
+"""Timestamp helpers shared across detectors.
+
+The same metrics batch flows through every detector in a pipeline run, so
+keeping the parse/format caches in one module means the second detector to
+touch a batch hits warm caches for every timestamp the first one handled.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+
+
+# Inputs are UTC once the Z suffix is gone, so epoch seconds fall out of
+# plain datetime subtraction - no tzinfo attach, no aware-datetime math.
+_EPOCH = datetime(1970, 1, 1)
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp_str(value: str) -> float:
+    if value.endswith("Z"):
+        value = value[:-1]
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        # Any explicit offset was always overwritten with UTC; dropping the
+        # tzinfo keeps that behavior while staying on the naive fast path.
+        parsed = parsed.replace(tzinfo=None)
+    return (parsed - _EPOCH).total_seconds()
+
+
+def parse_timestamp(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        raise ValueError(f"Unsupported timestamp type: {type(value)}")
+    return _parse_timestamp_str(value)
+
+
+@lru_cache(maxsize=8192)
+def isoformat(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
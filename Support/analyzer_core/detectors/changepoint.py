@@ -4,16 +4,29 @@ import math
 import statistics
 import uuid
 from datetime import datetime, timezone
+from itertools import accumulate
 from typing import Any, Dict, Iterable, List, MutableMapping, Optional
 
 from .base import BaseDetector
 
+try:  # Optional acceleration; the analyzer must keep working on a stock python3.
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+try:  # Optional C parser for the hot ISO-8601 path.
+    from ciso8601 import parse_datetime as _ciso_parse
+except ImportError:  # pragma: no cover - ciso8601 is optional
+    _ciso_parse = None
+
 
 def _parse_timestamp(value: Any) -> float:
     if isinstance(value, (int, float)):
         return float(value)
     if not isinstance(value, str):
         raise ValueError(f"Unsupported timestamp type: {type(value)}")
+    if _ciso_parse is not None:
+        return _ciso_parse(value).replace(tzinfo=timezone.utc).timestamp()
     if value.endswith("Z"):
         value = value[:-1]
     return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
@@ -123,28 +136,28 @@ class ChangePointDetector(BaseDetector):
     # ---- helpers ----------------------------------------------------------
 
     def _extract_series(self, metrics: Iterable[MutableMapping[str, Any]]) -> tuple[List[float], Dict[str, List[float]]]:
-        records: List[tuple[float, Dict[str, float]]] = []
+        # Columnar from the start: append into parallel lists instead of
+        # materializing a throwaway dict per record and re-zipping afterwards.
+        times: List[float] = []
+        columns: Dict[str, List[float]] = {key: [] for key in self.METRIC_KEYS}
         for entry in metrics:
             try:
                 ts = _parse_timestamp(entry["timestamp"])
             except Exception:
                 continue
-            record: Dict[str, float] = {}
+            times.append(ts)
             for metric_key in self.METRIC_KEYS:
                 try:
-                    record[metric_key] = float(entry.get(metric_key, 0.0))
+                    columns[metric_key].append(float(entry.get(metric_key, 0.0)))
                 except (TypeError, ValueError):
-                    record[metric_key] = 0.0
-            records.append((ts, record))
+                    columns[metric_key].append(0.0)
 
-        records.sort(key=lambda item: item[0])
-        times = [item[0] for item in records]
-        series_map: Dict[str, List[float]] = {key: [] for key in self.METRIC_KEYS}
-        for _, record in records:
-            for key in self.METRIC_KEYS:
-                series_map[key].append(record.get(key, 0.0))
+        if any(times[idx] > times[idx + 1] for idx in range(len(times) - 1)):
+            order = sorted(range(len(times)), key=times.__getitem__)
+            times = [times[idx] for idx in order]
+            columns = {key: [values[idx] for idx in order] for key, values in columns.items()}
 
-        series_map = {key: values for key, values in series_map.items() if any(values)}
+        series_map = {key: values for key, values in columns.items() if any(values)}
         return times, series_map
 
     @staticmethod
@@ -166,27 +179,34 @@ class ChangePointDetector(BaseDetector):
         threshold: float,
         min_gap_steps: int,
     ) -> List[Dict[str, Any]]:
+        if np is not None:
+            return self._detect_for_series_vectorized(times, series, metric, window_steps, threshold, min_gap_steps)
+
         change_points: List[Dict[str, Any]] = []
         last_index: Optional[int] = None
 
+        # Prefix sums over the series and its square make every paired-window
+        # mean and the pooled variance O(1) per center instead of O(W).
+        cs = [0.0]
+        cs.extend(accumulate(series))
+        cs2 = [0.0]
+        cs2.extend(accumulate(value * value for value in series))
+        window = float(window_steps)
+        combined_count = 2.0 * window
+
         for center in range(window_steps, len(series) - window_steps):
             if last_index is not None and center - last_index < min_gap_steps:
                 continue
 
-            before_window = series[center - window_steps:center]
-            after_window = series[center:center + window_steps]
-            if not before_window or not after_window:
-                continue
-
-            mean_before = statistics.fmean(before_window)
-            mean_after = statistics.fmean(after_window)
+            lo = center - window_steps
+            hi = center + window_steps
+            mean_before = (cs[center] - cs[lo]) / window
+            mean_after = (cs[hi] - cs[center]) / window
             diff = mean_after - mean_before
 
             # Pooled standard deviation of combined windows.
-            combined = before_window + after_window
-            if len(combined) < 4:
-                continue
-            variance = statistics.pvariance(combined)
+            combined_mean = (cs[hi] - cs[lo]) / combined_count
+            variance = max((cs2[hi] - cs2[lo]) / combined_count - combined_mean * combined_mean, 0.0)
             std_dev = math.sqrt(variance)
             if std_dev <= 1e-9:
                 if abs(diff) <= 1e-6:
@@ -214,6 +234,67 @@ class ChangePointDetector(BaseDetector):
 
         return change_points
 
+    def _detect_for_series_vectorized(
+        self,
+        times: List[float],
+        series: List[float],
+        metric: str,
+        window_steps: int,
+        threshold: float,
+        min_gap_steps: int,
+    ) -> List[Dict[str, Any]]:
+        """NumPy variant: score every center in one expression, then apply the
+        min-gap gating in a cheap linear pass over the few candidates."""
+
+        arr = np.asarray(series, dtype=np.float64)
+        centers = np.arange(window_steps, arr.size - window_steps)
+        if centers.size == 0:
+            return []
+
+        cs = np.concatenate(([0.0], np.cumsum(arr)))
+        cs2 = np.concatenate(([0.0], np.cumsum(arr * arr)))
+        lo = centers - window_steps
+        hi = centers + window_steps
+        window = float(window_steps)
+        combined_count = 2.0 * window
+
+        means_before = (cs[centers] - cs[lo]) / window
+        means_after = (cs[hi] - cs[centers]) / window
+        diffs = means_after - means_before
+        combined_means = (cs[hi] - cs[lo]) / combined_count
+        variances = np.maximum((cs2[hi] - cs2[lo]) / combined_count - combined_means * combined_means, 0.0)
+        stds = np.sqrt(variances)
+
+        degenerate = stds <= 1e-9
+        scores = np.where(
+            degenerate,
+            np.where(np.abs(diffs) <= 1e-6, 0.0, np.copysign(threshold * 2.0, diffs)),
+            diffs / np.where(degenerate, 1.0, stds),
+        )
+
+        change_points: List[Dict[str, Any]] = []
+        last_index: Optional[int] = None
+        for pos in np.flatnonzero(np.abs(scores) >= threshold):
+            center = int(centers[pos])
+            if last_index is not None and center - last_index < min_gap_steps:
+                continue
+            diff = float(diffs[pos])
+            change_points.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "timestamp": _isoformat(times[center]),
+                    "metric": metric,
+                    "direction": "increase" if diff > 0 else "decrease",
+                    "beforeMean": float(means_before[pos]),
+                    "afterMean": float(means_after[pos]),
+                    "meanDelta": diff,
+                    "score": float(scores[pos]),
+                }
+            )
+            last_index = center
+
+        return change_points
+
     def _build_diagnostics(
         self,
         sample_interval: Optional[float],
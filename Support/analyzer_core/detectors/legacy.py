@@ -1,21 +1,90 @@
 from __future__ import annotations
 
+import calendar
+import math
+import os
+import re
 import statistics
-import uuid
-from collections import defaultdict
+from collections import deque
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import groupby
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, MutableMapping, Optional
 
 from .base import BaseDetector
 
+try:  # Optional acceleration; the analyzer must keep working on a stock python3.
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+try:  # Optional C parser for the hot ISO-8601 path.
+    from ciso8601 import parse_datetime as _ciso_parse
+except ImportError:  # pragma: no cover - ciso8601 is optional
+    _ciso_parse = None
+
+
+# One combined pattern so each packet info string is scanned once instead of
+# running six independent substring searches; IGNORECASE replaces .lower().
+_PAYLOAD_RX = re.compile(
+    r"(?P<clienthello>client hello)|(?P<serverhello>server hello)|(?P<http>http)|(?P<verb>get|post|put|head)",
+    re.IGNORECASE,
+)
+_VERB_RX = re.compile(r"get|post|put|head", re.IGNORECASE)
+
+# Fixed-format fast path for the ISO-8601-Z timestamps the app encodes;
+# anything that does not match falls back to datetime.fromisoformat.
+_ISO_RX = re.compile(r"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?Z?")
+
+# Interned once; every anomaly record references these two objects instead
+# of materializing fresh literals inside the hot emitters.
+_SPIKE = "spike"
+_DROP = "drop"
+
+_UUID_POOL: List[str] = []
+
+
+def _new_id() -> str:
+    """Random UUID string drawn from a pooled os.urandom buffer.
+
+    uuid.uuid4() pays a getrandom syscall plus a UUID object construction
+    per call; formatting the version/variant-patched hex directly keeps the
+    RFC 4122 shape the Swift models decode (UUID.self) at a fraction of the
+    cost.
+    """
+
+    if not _UUID_POOL:
+        buffer = bytearray(os.urandom(16 * 256))
+        for offset in range(0, len(buffer), 16):
+            buffer[offset + 6] = (buffer[offset + 6] & 0x0F) | 0x40
+            buffer[offset + 8] = (buffer[offset + 8] & 0x3F) | 0x80
+        digits = buffer.hex()
+        _UUID_POOL.extend(
+            f"{digits[i:i + 8]}-{digits[i + 8:i + 12]}-{digits[i + 12:i + 16]}-{digits[i + 16:i + 20]}-{digits[i + 20:i + 32]}"
+            for i in range(0, len(digits), 32)
+        )
+    return _UUID_POOL.pop()
 
-def _parse_timestamp(value: Any) -> float:
-    if isinstance(value, (int, float)):
-        return float(value)
-    if not isinstance(value, str):
-        raise ValueError(f"Unsupported timestamp type: {type(value)}")
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp_str(value: str) -> float:
     try:
+        if _ciso_parse is not None:
+            # Unconditional replace mirrors the fromisoformat branch, which
+            # has always treated every timestamp as UTC.
+            return _ciso_parse(value).replace(tzinfo=timezone.utc).timestamp()
+        match = _ISO_RX.fullmatch(value)
+        if match is not None:
+            year, month, day, hour, minute, second, frac = match.groups()
+            month_i, day_i, hour_i, minute_i, second_i = int(month), int(day), int(hour), int(minute), int(second)
+            # timegm silently normalizes out-of-range fields, so bounds-check
+            # before trusting it; oddballs drop through to fromisoformat.
+            if 1 <= month_i <= 12 and 1 <= day_i <= 31 and hour_i < 24 and minute_i < 60 and second_i < 60:
+                seconds = calendar.timegm((int(year), month_i, day_i, hour_i, minute_i, second_i, 0, 0, 0))
+                if frac:
+                    return seconds + int(frac.ljust(6, "0")) / 1e6
+                return float(seconds)
         if value.endswith("Z"):
             value = value[:-1]
         return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
@@ -23,11 +92,27 @@ def _parse_timestamp(value: Any) -> float:
         raise ValueError(f"Cannot parse timestamp: {value}") from exc
 
 
+def _parse_timestamp(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        raise ValueError(f"Unsupported timestamp type: {type(value)}")
+    return _parse_timestamp_str(value)
+
+
+@lru_cache(maxsize=4096)
 def _isoformat(ts: float) -> str:
     return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
 
 
 def _safe_float(value: Any) -> Optional[float]:
+    # Exact-type fast paths first: the overwhelmingly common case is a plain
+    # float (or int) straight from the JSON decoder, which skips both the
+    # None test and the isinstance dispatch below.
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
     if value is None:
         return None
     if isinstance(value, (int, float)):
@@ -40,6 +125,68 @@ def _safe_float(value: Any) -> Optional[float]:
     return None
 
 
+def _float_column(metrics: List[MutableMapping[str, Any]], key: str) -> Any:
+    """Extract one numeric column from the metric records.
+
+    The explicit float() cast stays inside the generator so malformed values
+    keep raising (np.fromiter would silently coerce None to NaN); the result
+    is an ndarray when NumPy is present so downstream kernels skip a copy.
+    """
+
+    values = (float(m.get(key, 0.0)) for m in metrics)
+    if np is not None:
+        return np.fromiter(values, dtype=np.float64, count=len(metrics))
+    return list(values)
+
+
+def _coerce_length(value: Any) -> float:
+    try:
+        length = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return length if length > 0.0 else 0.0
+
+
+def _packet_lengths(packets: Iterable[MutableMapping[str, Any]]) -> Any:
+    """Coerce packet lengths once so the payload summary and the summary
+    totals share a single pass; returns an ndarray when NumPy is present."""
+
+    lengths = (_coerce_length(pkt.get("length", 0.0)) for pkt in packets)
+    if np is not None:
+        return np.fromiter(lengths, dtype=np.float64)
+    return list(lengths)
+
+
+def _sum_lengths(lengths: Any) -> float:
+    if np is not None and isinstance(lengths, np.ndarray):
+        return float(lengths.sum())
+    return float(sum(lengths))
+
+
+def _normalize_tag_metrics(
+    tag_metrics_list: List[MutableMapping[str, Any]],
+) -> Dict[tuple[str, str], tuple[List[int], List[float]]]:
+    """Validate and coerce the nested tagMetrics payload once, producing an
+    appearance-ordered (tick indices, byte values) column pair per tag."""
+
+    series: Dict[tuple[str, str], tuple[List[int], List[float]]] = {}
+    for idx, tag_metrics in enumerate(tag_metrics_list):
+        for tag_type, entries in (tag_metrics or {}).items():
+            if not isinstance(entries, MutableMapping):
+                continue
+            for tag_value, stats in (entries or {}).items():
+                if not isinstance(stats, MutableMapping):
+                    continue
+                try:
+                    value = float(stats.get("bytes", 0.0))
+                except (TypeError, ValueError):
+                    continue
+                ticks, values = series.setdefault((tag_type, tag_value), ([], []))
+                ticks.append(idx)
+                values.append(value)
+    return series
+
+
 def _format_bytes(value: float) -> str:
     units = ["B", "KB", "MB", "GB", "TB"]
     if value <= 0:
@@ -67,25 +214,59 @@ class LegacyAnomalyDetector(BaseDetector):
 
     @staticmethod
     def _sliding_baseline(values: List[float], window: int) -> List[float]:
+        # len() rather than truthiness: the series may be an ndarray.
+        if len(values) == 0:
+            return []
+        if np is not None:
+            series = np.asarray(values, dtype=np.float64)
+            idx = np.arange(series.size)
+            start = np.maximum(0, idx - window + 1)
+            cumulative = np.concatenate(([0.0], np.cumsum(series)))
+            counts = idx - start + 1
+            return ((cumulative[idx + 1] - cumulative[start]) / counts).tolist()
         baseline: List[float] = []
-        for idx in range(len(values)):
-            start = max(0, idx - window + 1)
-            window_values = values[start: idx + 1]
-            if window_values:
-                baseline.append(sum(window_values) / len(window_values))
-            else:
-                baseline.append(values[idx])
+        running = 0.0
+        for idx, value in enumerate(values):
+            running += value
+            if idx >= window:
+                running -= values[idx - window]
+            baseline.append(running / min(idx + 1, window))
         return baseline
 
+    @staticmethod
+    def _sliding_baselines(columns: List[Any], window: int) -> List[List[float]]:
+        """Rolling means for several equal-length series in one go.
+
+        The index/start/count arrays depend only on the series length, so the
+        three baseline passes share them (and one cumulative-sum buffer)
+        instead of rebuilding identical arrays per column.
+        """
+
+        if np is None or not columns or len(columns[0]) == 0:
+            return [LegacyAnomalyDetector._sliding_baseline(values, window) for values in columns]
+        size = len(columns[0])
+        idx = np.arange(size)
+        start = np.maximum(0, idx - window + 1)
+        counts = idx - start + 1
+        cumulative = np.empty(size + 1, dtype=np.float64)
+        cumulative[0] = 0.0
+        baselines: List[List[float]] = []
+        for values in columns:
+            np.cumsum(np.asarray(values, dtype=np.float64), out=cumulative[1:])
+            baselines.append(((cumulative[idx + 1] - cumulative[start]) / counts).tolist())
+        return baselines
+
     @staticmethod
     def _ewma(values: List[float], alpha: float) -> List[float]:
-        if not values:
+        if len(values) == 0:
             return []
-        baseline = [values[0]]
         estimate = values[0]
+        baseline = [estimate]
+        append = baseline.append
+        one_minus_alpha = 1.0 - alpha
         for value in values[1:]:
-            estimate = alpha * value + (1.0 - alpha) * estimate
-            baseline.append(estimate)
+            estimate = alpha * value + one_minus_alpha * estimate
+            append(estimate)
         return baseline
 
     @staticmethod
@@ -106,9 +287,17 @@ class LegacyAnomalyDetector(BaseDetector):
 
     @staticmethod
     def _rolling_stats_mad(values: List[float]) -> tuple[float, float]:
-        median = statistics.median(values)
-        deviations = [abs(v - median) for v in values]
-        mad = statistics.median(deviations) if deviations else 0.0
+        if np is not None and len(values) > 0:
+            # np.median runs a C quickselect (partition) instead of the full
+            # sort statistics.median pays, and the deviations come from one
+            # vectorized subtraction.
+            arr = np.asarray(values, dtype=np.float64)
+            median = float(np.median(arr))
+            mad = float(np.median(np.abs(arr - median)))
+        else:
+            median = statistics.median(values)
+            deviations = [abs(v - median) for v in values]
+            mad = statistics.median(deviations) if deviations else 0.0
         if mad <= 1e-9:
             return median, 0.0
         return median, 1.4826 * mad
@@ -127,29 +316,49 @@ class LegacyAnomalyDetector(BaseDetector):
 
         try:
             times = [_parse_timestamp(m["timestamp"]) for m in metrics]
-            bytes_series = [float(m.get("bytesPerSecond", 0.0)) for m in metrics]
-            packet_series = [float(m.get("packetsPerSecond", 0.0)) for m in metrics]
-            flow_series = [float(m.get("flowsPerSecond", 0.0)) for m in metrics]
+            # Numeric columns go straight into float64 arrays when NumPy is
+            # available: every downstream kernel consumes them column-wise,
+            # so materializing intermediate Python lists just forces a copy
+            # at each np.asarray call later on.
+            bytes_series = _float_column(metrics, "bytesPerSecond")
+            packet_series = _float_column(metrics, "packetsPerSecond")
+            flow_series = _float_column(metrics, "flowsPerSecond")
             windows = [m.get("window", "perSecond") for m in metrics]
             protocol_hists = [m.get("protocolHistogram", {}) or {} for m in metrics]
             tag_metrics_list = [m.get("tagMetrics", {}) or {} for m in metrics]
         except (KeyError, ValueError, TypeError) as exc:
             raise ValueError(f"Invalid metric record: {exc}") from exc
 
-        paired = sorted(
-            zip(times, bytes_series, packet_series, flow_series, windows, protocol_hists, tag_metrics_list),
-            key=lambda item: item[0]
-        )
-        times = [p[0] for p in paired]
-        bytes_series = [p[1] for p in paired]
-        packet_series = [p[2] for p in paired]
-        flow_series = [p[3] for p in paired]
-        windows = [p[4] for p in paired]
-        protocol_hists = [p[5] for p in paired]
-        tag_metrics_list = [p[6] for p in paired]
-
-        diffs = [times[i + 1] - times[i] for i in range(len(times) - 1)]
-        sample_interval = max(1.0, statistics.median(diffs)) if diffs else 1.0
+        # Metrics normally arrive pre-sorted; only pay for a sort when they do
+        # not, and even then sort an index once instead of zipping seven
+        # columns into throwaway tuples and unzipping them again.
+        if any(times[idx] > times[idx + 1] for idx in range(len(times) - 1)):
+            if np is not None:
+                # argsort compares raw float64s in C; the numeric columns are
+                # already ndarrays so a fancy-index gather reorders them
+                # without touching Python objects.
+                order_arr = np.argsort(np.asarray(times, dtype=np.float64), kind="stable")
+                order = order_arr.tolist()
+                bytes_series = bytes_series[order_arr]
+                packet_series = packet_series[order_arr]
+                flow_series = flow_series[order_arr]
+            else:
+                order = sorted(range(len(times)), key=times.__getitem__)
+                bytes_series = [bytes_series[idx] for idx in order]
+                packet_series = [packet_series[idx] for idx in order]
+                flow_series = [flow_series[idx] for idx in order]
+            times = [times[idx] for idx in order]
+            windows = [windows[idx] for idx in order]
+            protocol_hists = [protocol_hists[idx] for idx in order]
+            tag_metrics_list = [tag_metrics_list[idx] for idx in order]
+
+        if np is not None and len(times) > 1:
+            # np.median selects via partition in C instead of fully sorting
+            # the N-1 Python floats statistics.median would.
+            sample_interval = max(1.0, float(np.median(np.diff(np.asarray(times, dtype=np.float64)))))
+        else:
+            diffs = [times[i + 1] - times[i] for i in range(len(times) - 1)]
+            sample_interval = max(1.0, statistics.median(diffs)) if diffs else 1.0
 
         window_seconds = float(params.get("windowSeconds", 60))
         z_threshold = float(params.get("zThreshold", 3.0))
@@ -166,22 +375,39 @@ class LegacyAnomalyDetector(BaseDetector):
             packet_anomalies = self._detect_anomalies_ewma(times, packet_series, baseline_packets, "packetsPerSecond", z_threshold, window_count)
             flow_anomalies = self._detect_anomalies_ewma(times, flow_series, baseline_flows, "flowsPerSecond", z_threshold, window_count)
         else:
-            baseline_bytes = self._sliding_baseline(bytes_series, window_count)
-            baseline_packets = self._sliding_baseline(packet_series, window_count)
-            baseline_flows = self._sliding_baseline(flow_series, window_count)
-            stats_fn = self._rolling_stats_mad if algorithm == "mad" else self._rolling_stats
-            byte_anomalies = self._detect_anomalies(times, bytes_series, baseline_bytes, "bytesPerSecond", z_threshold, window_count, stats_fn=stats_fn)
-            packet_anomalies = self._detect_anomalies(times, packet_series, baseline_packets, "packetsPerSecond", z_threshold, window_count, stats_fn=stats_fn)
-            flow_anomalies = self._detect_anomalies(times, flow_series, baseline_flows, "flowsPerSecond", z_threshold, window_count, stats_fn=stats_fn)
+            baseline_bytes, baseline_packets, baseline_flows = self._sliding_baselines(
+                [bytes_series, packet_series, flow_series], window_count
+            )
+            if np is not None and algorithm != "mad":
+                byte_anomalies, packet_anomalies, flow_anomalies = self._detect_anomalies_batch(
+                    times,
+                    [
+                        ("bytesPerSecond", bytes_series, baseline_bytes),
+                        ("packetsPerSecond", packet_series, baseline_packets),
+                        ("flowsPerSecond", flow_series, baseline_flows),
+                    ],
+                    z_threshold,
+                    window_count,
+                )
+            else:
+                stats_fn = self._rolling_stats_mad if algorithm == "mad" else self._rolling_stats
+                byte_anomalies = self._detect_anomalies(times, bytes_series, baseline_bytes, "bytesPerSecond", z_threshold, window_count, stats_fn=stats_fn)
+                packet_anomalies = self._detect_anomalies(times, packet_series, baseline_packets, "packetsPerSecond", z_threshold, window_count, stats_fn=stats_fn)
+                flow_anomalies = self._detect_anomalies(times, flow_series, baseline_flows, "flowsPerSecond", z_threshold, window_count, stats_fn=stats_fn)
 
         tag_anomalies = self._detect_tag_anomalies(times, tag_metrics_list, window_count, z_threshold, algorithm)
 
+        packet_lengths = _packet_lengths(packets)
+
         payload_summary: Dict[str, float] = {}
         if payload_enabled:
-            payload_summary = self._summarize_payload(packets)
+            payload_summary = self._summarize_payload(packets, packet_lengths)
 
         anomalies = byte_anomalies + packet_anomalies + flow_anomalies + tag_anomalies
         clusters = self._build_clusters(anomalies)
+        # The helper field must not leak into the serialized payload.
+        for anomaly in anomalies:
+            anomaly.pop("_ts", None)
 
         context.add_score(
             detector="legacy",
@@ -190,39 +416,59 @@ class LegacyAnomalyDetector(BaseDetector):
             reasons=["legacy.detector.active"],
         )
 
-        result = {
-            "metrics": [
+        # Format each timestamp once; the metrics and baseline payloads share
+        # the same instants, so this halves the datetime construction work
+        # even with the memoized _isoformat.
+        iso_times = [_isoformat(ts) for ts in times]
+
+        # One fused pass over a single zip builds both row lists instead of
+        # two structurally identical loops re-walking the shared columns.
+        metrics_payload: List[Dict[str, Any]] = []
+        baseline_payload: List[Dict[str, Any]] = []
+        append_metric = metrics_payload.append
+        append_baseline = baseline_payload.append
+        for iso_ts, window, bytes_val, pkt_val, flow_val, hist, tag_metrics, base_bytes, base_packets, base_flows in zip(
+            iso_times,
+            windows,
+            bytes_series,
+            packet_series,
+            flow_series,
+            protocol_hists,
+            tag_metrics_list,
+            baseline_bytes,
+            baseline_packets,
+            baseline_flows,
+        ):
+            append_metric(
                 {
-                    "timestamp": _isoformat(ts),
+                    "timestamp": iso_ts,
                     "window": window,
-                    "bytesPerSecond": bytes_val,
-                    "packetsPerSecond": pkt_val,
-                    "flowsPerSecond": flow_val,
+                    "bytesPerSecond": round(bytes_val, 3),
+                    "packetsPerSecond": round(pkt_val, 3),
+                    "flowsPerSecond": round(flow_val, 3),
                     "protocolHistogram": hist,
                     "tagMetrics": tag_metrics,
                 }
-                for ts, bytes_val, pkt_val, flow_val, window, hist, tag_metrics in zip(
-                    times, bytes_series, packet_series, flow_series, windows, protocol_hists, tag_metrics_list
-                )
-            ],
-            "baseline": [
+            )
+            append_baseline(
                 {
-                    "timestamp": _isoformat(ts),
+                    "timestamp": iso_ts,
                     "window": window,
-                    "bytesPerSecond": base_bytes,
-                    "packetsPerSecond": base_packets,
-                    "flowsPerSecond": base_flows,
+                    "bytesPerSecond": round(base_bytes, 3),
+                    "packetsPerSecond": round(base_packets, 3),
+                    "flowsPerSecond": round(base_flows, 3),
                     "protocolHistogram": {},
                     "tagMetrics": {},
                 }
-                for ts, base_bytes, base_packets, base_flows, window in zip(
-                    times, baseline_bytes, baseline_packets, baseline_flows, windows
-                )
-            ],
+            )
+
+        result = {
+            "metrics": metrics_payload,
+            "baseline": baseline_payload,
             "anomalies": anomalies,
             "summary": {
                 "totalPackets": len(packets),
-                "totalBytes": sum(max(0, float(pkt.get("length", 0))) for pkt in packets),
+                "totalBytes": _sum_lengths(packet_lengths),
                 "meanBytesPerSecond": sum(bytes_series) / len(bytes_series),
                 "meanPacketsPerSecond": sum(packet_series) / len(packet_series),
                 "meanFlowsPerSecond": sum(flow_series) / len(flow_series),
@@ -257,29 +503,115 @@ class LegacyAnomalyDetector(BaseDetector):
         stats_fn,
     ) -> List[Dict[str, Any]]:
         anomalies: List[Dict[str, Any]] = []
+        incremental = stats_fn is self._rolling_stats
+        sum_x = 0.0
+        sum_x2 = 0.0
         for idx, (ts, value, base) in enumerate(zip(timestamps, series, baseline)):
             start = max(0, idx - window_count)
-            window_values = series[start:idx]
-            if len(window_values) < 3:
+            if incremental and idx > 0:
+                entering = series[idx - 1]
+                sum_x += entering
+                sum_x2 += entering * entering
+                leaving_idx = idx - window_count - 1
+                if leaving_idx >= 0:
+                    leaving = series[leaving_idx]
+                    sum_x -= leaving
+                    sum_x2 -= leaving * leaving
+            count = idx - start
+            if count < 3:
                 continue
-            mean, std = stats_fn(window_values)
+            if incremental:
+                mean = sum_x / count
+                variance = sum_x2 / count - mean * mean
+                std = math.sqrt(variance) if variance > 0.0 else 0.0
+                if std <= 1e-9:
+                    # Re-derive from the raw slice so the MAD fallback in
+                    # _rolling_stats still applies on collapsed windows.
+                    mean, std = stats_fn(series[start:idx])
+            else:
+                mean, std = stats_fn(series[start:idx])
             if std <= 1e-9:
                 continue
             z_score = (value - mean) / std
             if abs(z_score) >= threshold:
                 anomalies.append(
                     {
-                        "id": str(uuid.uuid4()),
+                        "id": _new_id(),
                         "timestamp": _isoformat(ts),
                         "metric": metric_name,
                         "value": value,
                         "baseline": base,
                         "zScore": z_score,
-                        "direction": "spike" if value >= mean else "drop",
+                        "direction": _SPIKE if value >= mean else _DROP,
+                        "_ts": ts,
                     }
                 )
         return anomalies
 
+    def _detect_anomalies_batch(
+        self,
+        timestamps: List[float],
+        columns: List[tuple[str, List[float], List[float]]],
+        threshold: float,
+        window_count: int,
+    ) -> List[List[Dict[str, Any]]]:
+        """Fused NumPy scan over multiple metric columns (z-score algorithm).
+
+        Stacks the columns into an (N, M) matrix, derives every rolling
+        mean/std from two cumulative sums, and only materializes dict records
+        for the indices that cross the threshold. Windows whose variance
+        collapses are re-derived through _rolling_stats so the MAD rescue
+        branch matches the scalar path.
+        """
+
+        n = len(timestamps)
+        matrix = np.column_stack([np.asarray(series, dtype=np.float64) for _, series, _ in columns])
+        zeros = np.zeros((1, matrix.shape[1]))
+        cs1 = np.vstack((zeros, np.cumsum(matrix, axis=0)))
+        cs2 = np.vstack((zeros, np.cumsum(matrix * matrix, axis=0)))
+        idx = np.arange(n)
+        counts = np.minimum(idx, window_count)
+        lo = idx - counts
+        valid = counts >= 3
+        safe_counts = np.where(valid, counts, 1)[:, None]
+        means = (cs1[idx] - cs1[lo]) / safe_counts
+        variances = np.maximum((cs2[idx] - cs2[lo]) / safe_counts - means * means, 0.0)
+        stds = np.sqrt(variances)
+
+        results: List[List[Dict[str, Any]]] = []
+        for col, (metric_name, series, baseline) in enumerate(columns):
+            col_means = means[:, col]
+            col_stds = stds[:, col]
+            for i in np.flatnonzero(valid & (col_stds <= 1e-9)):
+                position = int(i)
+                mean, std = self._rolling_stats(series[position - int(counts[position]): position])
+                col_means[i] = mean
+                col_stds[i] = std
+            # Collapsed windows divide by inf into harmless zeros, so the
+            # whole z column is computed without data-dependent branches.
+            safe_stds = np.where(col_stds <= 1e-9, np.inf, col_stds)
+            z_scores = (matrix[:, col] - col_means) / safe_stds
+            hits = np.flatnonzero(valid & np.isfinite(safe_stds) & (np.abs(z_scores) >= threshold))
+            # tolist() so the serializers see plain str, not np.str_.
+            directions = np.where(matrix[hits, col] >= col_means[hits], _SPIKE, _DROP).tolist()
+            records: List[Dict[str, Any]] = []
+            for row, i in enumerate(hits):
+                position = int(i)
+                records.append(
+                    {
+                        "id": _new_id(),
+                        "timestamp": _isoformat(timestamps[position]),
+                        "metric": metric_name,
+                        "value": series[position],
+                        "baseline": baseline[position],
+                        "zScore": float(z_scores[i]),
+                        "direction": directions[row],
+                        "_ts": timestamps[position],
+                    }
+                )
+            results.append(records)
+        return results
+
     def _detect_anomalies_ewma(
         self,
         timestamps: List[float],
@@ -289,31 +621,107 @@ class LegacyAnomalyDetector(BaseDetector):
         threshold: float,
         window_count: int,
     ) -> List[Dict[str, Any]]:
+        if np is not None:
+            return self._detect_anomalies_ewma_vectorized(
+                timestamps, series, baseline, metric_name, threshold, window_count
+            )
+
         anomalies: List[Dict[str, Any]] = []
-        residuals: List[float] = []
-        for idx, (ts, value, base) in enumerate(zip(timestamps, series, baseline)):
+        # The residual window only ever looks back window_count steps, so a
+        # bounded deque plus running sums replaces the unbounded list and the
+        # O(W) slice-and-restat at every index.
+        window: deque[float] = deque(maxlen=window_count)
+        sum_r = 0.0
+        sum_r2 = 0.0
+        for ts, value, base in zip(timestamps, series, baseline):
             residual = value - base
-            residuals.append(residual)
-            start = max(0, idx - window_count)
-            window_values = residuals[start:idx]
-            if len(window_values) < 3:
-                continue
-            mean, std = self._rolling_stats(window_values)
-            if std <= 1e-9:
-                continue
-            score = abs(residual - mean) / std
-            if score >= threshold:
-                anomalies.append(
-                    {
-                        "id": str(uuid.uuid4()),
-                        "timestamp": _isoformat(ts),
-                        "metric": metric_name,
-                        "value": value,
-                        "baseline": base,
-                        "zScore": score,
-                        "direction": "spike" if residual >= 0 else "drop",
-                    }
-                )
+            count = len(window)
+            if count >= 3:
+                mean = sum_r / count
+                variance = sum_r2 / count - mean * mean
+                std = math.sqrt(variance) if variance > 0.0 else 0.0
+                if std <= 1e-9:
+                    # Rare: re-derive so the MAD rescue in _rolling_stats
+                    # still applies on collapsed windows.
+                    mean, std = self._rolling_stats(list(window))
+                if std > 1e-9:
+                    score = abs(residual - mean) / std
+                    if score >= threshold:
+                        anomalies.append(
+                            {
+                                "id": _new_id(),
+                                "timestamp": _isoformat(ts),
+                                "metric": metric_name,
+                                "value": value,
+                                "baseline": base,
+                                "zScore": score,
+                                "direction": _SPIKE if residual >= 0 else _DROP,
+                                "_ts": ts,
+                            }
+                        )
+            if count == window_count:
+                evicted = window[0]
+                sum_r -= evicted
+                sum_r2 -= evicted * evicted
+            window.append(residual)
+            sum_r += residual
+            sum_r2 += residual * residual
+        return anomalies
+
+    def _detect_anomalies_ewma_vectorized(
+        self,
+        timestamps: List[float],
+        series: List[float],
+        baseline: List[float],
+        metric_name: str,
+        threshold: float,
+        window_count: int,
+    ) -> List[Dict[str, Any]]:
+        """NumPy variant of the EWMA residual scan.
+
+        residuals = series - baseline is one array subtraction, and the
+        trailing-window mean/std come from the same cumulative-sum identity
+        as the metric matrix; dicts are built only for threshold crossers.
+        """
+
+        residuals = np.asarray(series, dtype=np.float64) - np.asarray(baseline, dtype=np.float64)
+        n = residuals.size
+        cs1 = np.concatenate(([0.0], np.cumsum(residuals)))
+        cs2 = np.concatenate(([0.0], np.cumsum(residuals * residuals)))
+        idx = np.arange(n)
+        counts = np.minimum(idx, window_count)
+        lo = idx - counts
+        valid = counts >= 3
+        safe_counts = np.where(valid, counts, 1)
+        means = (cs1[idx] - cs1[lo]) / safe_counts
+        variances = np.maximum((cs2[idx] - cs2[lo]) / safe_counts - means * means, 0.0)
+        stds = np.sqrt(variances)
+        for i in np.flatnonzero(valid & (stds <= 1e-9)):
+            position = int(i)
+            # Rare: re-derive from the raw window so the MAD rescue in
+            # _rolling_stats still applies on collapsed windows.
+            mean, std = self._rolling_stats(residuals[position - int(counts[position]): position])
+            means[i] = mean
+            stds[i] = std
+        safe_stds = np.where(stds <= 1e-9, np.inf, stds)
+        scores = np.abs(residuals - means) / safe_stds
+        hits = np.flatnonzero(valid & np.isfinite(safe_stds) & (scores >= threshold))
+        directions = np.where(residuals[hits] >= 0, _SPIKE, _DROP).tolist()
+        anomalies: List[Dict[str, Any]] = []
+        for row, i in enumerate(hits):
+            position = int(i)
+            anomalies.append(
+                {
+                    "id": _new_id(),
+                    "timestamp": _isoformat(timestamps[position]),
+                    "metric": metric_name,
+                    "value": series[position],
+                    "baseline": baseline[position],
+                    "zScore": float(scores[i]),
+                    "direction": directions[row],
+                    "_ts": timestamps[position],
+                }
+            )
         return anomalies
 
     def _detect_tag_anomalies(
@@ -324,9 +732,23 @@ class LegacyAnomalyDetector(BaseDetector):
         z_threshold: float,
         algorithm: str,
     ) -> List[Dict[str, Any]]:
-        tag_history: Dict[tuple[str, str], List[float]] = {}
+        if np is not None and algorithm != "mad":
+            return self._detect_tag_anomalies_vectorized(
+                timestamps, list(tag_metrics_list)[:len(timestamps)], window_count, z_threshold
+            )
+
+        # Per-tag state: bounded deque plus running sum/sum-of-squares so each
+        # tick is O(1) instead of re-slicing and re-summing the history list.
+        tag_history: Dict[tuple[str, str], List[Any]] = {}
         tag_anomalies: List[Dict[str, Any]] = []
         stats_fn = self._rolling_stats_mad if algorithm == "mad" else self._rolling_stats
+        incremental = stats_fn is self._rolling_stats
+        # Bind the per-hit helpers once; they are resolved on every inner
+        # iteration otherwise.
+        append_anomaly = tag_anomalies.append
+        new_id = _new_id
+        isoformat = _isoformat
+        sqrt = math.sqrt
         for idx, ts in enumerate(timestamps):
             tag_metrics = tag_metrics_list[idx] if idx < len(tag_metrics_list) else {}
             for tag_type, entries in (tag_metrics or {}).items():
@@ -340,54 +762,146 @@ class LegacyAnomalyDetector(BaseDetector):
                     except (TypeError, ValueError):
                         continue
                     key = (tag_type, tag_value)
-                    history = tag_history.setdefault(key, [])
+                    state = tag_history.get(key)
+                    if state is None:
+                        state = tag_history[key] = [deque(maxlen=window_count), 0.0, 0.0]
+                    history, sum_x, sum_x2 = state
+                    if len(history) == window_count:
+                        evicted = history[0]
+                        sum_x -= evicted
+                        sum_x2 -= evicted * evicted
                     history.append(value)
-                    max_history = max(window_count * 4, window_count + 1)
-                    if len(history) > max_history:
-                        del history[:-max_history]
+                    sum_x += value
+                    sum_x2 += value * value
+                    state[1] = sum_x
+                    state[2] = sum_x2
                     if len(history) < window_count:
                         continue
-                    window_values = history[-window_count:]
-                    mean, std = stats_fn(window_values)
+                    if incremental:
+                        mean = sum_x / window_count
+                        variance = sum_x2 / window_count - mean * mean
+                        std = sqrt(variance) if variance > 0.0 else 0.0
+                        if std <= 1e-9:
+                            # Rare: re-derive from the raw window so the MAD
+                            # rescue in _rolling_stats still applies.
+                            mean, std = stats_fn(list(history))
+                    else:
+                        mean, std = stats_fn(list(history))
                     if std <= 1e-9:
                         continue
                     z_score = (value - mean) / std
                     if abs(z_score) >= z_threshold:
-                        tag_anomalies.append(
+                        append_anomaly(
                             {
-                                "id": str(uuid.uuid4()),
-                                "timestamp": _isoformat(ts),
+                                "id": new_id(),
+                                "timestamp": isoformat(ts),
                                 "metric": f"bytesPerSecond[{tag_type}]",
                                 "value": value,
                                 "baseline": mean,
                                 "zScore": z_score,
-                                "direction": "spike" if z_score > 0 else "drop",
+                                "direction": _SPIKE if z_score > 0 else _DROP,
                                 "tagType": tag_type,
                                 "tagValue": tag_value,
                                 "context": {
                                     "bytes": f"{value:.1f}",
                                     "baseline": f"{mean:.1f}",
                                 },
+                                "_ts": ts,
                             }
                         )
         return tag_anomalies
 
-    def _summarize_payload(self, packets: Iterable[MutableMapping[str, Any]]) -> Dict[str, float]:
+    def _detect_tag_anomalies_vectorized(
+        self,
+        timestamps: List[float],
+        tag_metrics_list: List[MutableMapping[str, Any]],
+        window_count: int,
+        z_threshold: float,
+    ) -> List[Dict[str, Any]]:
+        """NumPy path: each tag's appearance series becomes a column scanned
+        with the same cumulative-sum rolling stats as the metric matrix."""
+
+        hits: List[tuple[int, Dict[str, Any]]] = []
+        for (tag_type, tag_value), (ticks, values) in _normalize_tag_metrics(tag_metrics_list).items():
+            count = len(values)
+            if count < window_count:
+                continue
+            arr = np.asarray(values, dtype=np.float64)
+            cs1 = np.concatenate(([0.0], np.cumsum(arr)))
+            cs2 = np.concatenate(([0.0], np.cumsum(arr * arr)))
+            pos = np.arange(window_count - 1, count)
+            means = (cs1[pos + 1] - cs1[pos + 1 - window_count]) / window_count
+            variances = np.maximum((cs2[pos + 1] - cs2[pos + 1 - window_count]) / window_count - means * means, 0.0)
+            stds = np.sqrt(variances)
+            for row in np.flatnonzero(stds <= 1e-9):
+                position = int(pos[row])
+                mean, std = self._rolling_stats(values[position + 1 - window_count: position + 1])
+                means[row] = mean
+                stds[row] = std
+            safe_stds = np.where(stds <= 1e-9, np.inf, stds)
+            z_scores = (arr[pos] - means) / safe_stds
+            tag_hits = np.flatnonzero(np.isfinite(safe_stds) & (np.abs(z_scores) >= z_threshold))
+            directions = np.where(z_scores[tag_hits] > 0, _SPIKE, _DROP).tolist()
+            for hit_row, row in enumerate(tag_hits):
+                position = int(pos[row])
+                tick = ticks[position]
+                value = values[position]
+                mean = float(means[row])
+                z_score = float(z_scores[row])
+                hits.append(
+                    (
+                        tick,
+                        {
+                            "id": _new_id(),
+                            "timestamp": _isoformat(timestamps[tick]),
+                            "metric": f"bytesPerSecond[{tag_type}]",
+                            "value": value,
+                            "baseline": mean,
+                            "zScore": z_score,
+                            "direction": directions[hit_row],
+                            "tagType": tag_type,
+                            "tagValue": tag_value,
+                            "context": {
+                                "bytes": f"{value:.1f}",
+                                "baseline": f"{mean:.1f}",
+                            },
+                            "_ts": timestamps[tick],
+                        },
+                    )
+                )
+
+        hits.sort(key=lambda item: item[0])
+        return [record for _, record in hits]
+
+    def _summarize_payload(self, packets: Iterable[MutableMapping[str, Any]], packet_lengths: Any) -> Dict[str, float]:
         tls_client_hello = 0
         tls_server_hello = 0
         http_requests = 0
-        total_payload_bytes = 0.0
+        total_payload_bytes = _sum_lengths(packet_lengths)
         for pkt in packets:
-            info = (pkt.get("info") or "").lower()
-            try:
-                total_payload_bytes += max(0.0, float(pkt.get("length", 0.0)))
-            except (TypeError, ValueError):
-                pass
-            if "client hello" in info:
+            info = pkt.get("info") or ""
+            saw_client_hello = saw_server_hello = saw_http = saw_verb = False
+            for match in _PAYLOAD_RX.finditer(info):
+                group = match.lastgroup
+                if group == "clienthello":
+                    saw_client_hello = True
+                elif group == "serverhello":
+                    saw_server_hello = True
+                elif group == "http":
+                    saw_http = True
+                else:
+                    saw_verb = True
+                if saw_client_hello and saw_server_hello and saw_http and saw_verb:
+                    break
+            if saw_http and not saw_verb:
+                # A verb overlapping a matched token (e.g. "httpost") is not
+                # seen by the non-overlapping scan; re-check just the verbs.
+                saw_verb = _VERB_RX.search(info) is not None
+            if saw_client_hello:
                 tls_client_hello += 1
-            if "server hello" in info:
+            if saw_server_hello:
                 tls_server_hello += 1
-            if "http" in info and ("get" in info or "post" in info or "put" in info or "head" in info):
+            if saw_http and saw_verb:
                 http_requests += 1
         payload_summary = {
             "tlsClientHello": float(tls_client_hello),
@@ -402,24 +916,35 @@ class LegacyAnomalyDetector(BaseDetector):
         if not anomaly_list:
             return []
 
-        buckets: Dict[tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
+        # Parse each timestamp exactly once and sort globally so every group
+        # comes out time-ordered from a single O(K log K) pass.
+        keyed: List[tuple[str, str, float, MutableMapping[str, Any]]] = []
         for anomaly in anomaly_list:
             tag_type = anomaly.get("tagType")
             tag_value = anomaly.get("tagValue")
             metric = anomaly.get("metric", "unknown")
             key_type = tag_type or "metric"
             key_value = tag_value or metric
-            buckets[(key_type, key_value)].append(anomaly)
+            # Detectors stash the raw epoch float under "_ts" so clustering
+            # does not re-parse the ISO string it just produced; parsing
+            # remains as a fallback for records built elsewhere.
+            ts = anomaly.get("_ts")
+            if ts is None:
+                ts = _parse_timestamp(anomaly["timestamp"])
+            keyed.append((key_type, key_value, ts, anomaly))
+
+        keyed.sort(key=lambda item: (item[0], item[1], item[2]))
 
         clusters: List[Dict[str, Any]] = []
-        for (key_type, key_value), items in buckets.items():
-            if not items:
-                continue
-            ordered = sorted(items, key=lambda entry: _parse_timestamp(entry["timestamp"]))
-            start_ts = _parse_timestamp(ordered[0]["timestamp"])
-            end_ts = _parse_timestamp(ordered[-1]["timestamp"])
-            peak = max(ordered, key=lambda entry: abs(float(entry.get("zScore", 0.0))))
-            peak_ts = _parse_timestamp(peak["timestamp"])
+        for (key_type, key_value), group in groupby(keyed, key=lambda item: (item[0], item[1])):
+            items = list(group)
+            ordered = [entry[3] for entry in items]
+            start_ts = items[0][2]
+            end_ts = items[-1][2]
+            peak_ts, peak = max(
+                ((entry[2], entry[3]) for entry in items),
+                key=lambda pair: abs(float(pair[1].get("zScore", 0.0))),
+            )
             peak_value = float(peak.get("value", 0.0))
             peak_z = abs(float(peak.get("zScore", 0.0)))
             bytes_values = [
@@ -436,7 +961,7 @@ class LegacyAnomalyDetector(BaseDetector):
             confidence = min(1.0, 0.35 + len(ordered) / 10.0 + peak_z / 6.0)
 
             cluster = {
-                "id": str(uuid.uuid4()),
+                "id": _new_id(),
                 "tagType": None if key_type == "metric" else key_type,
                 "tagValue": None if key_type == "metric" else key_value,
                 "metric": metric_name,
@@ -1,28 +1,63 @@
 from __future__ import annotations
 
+import calendar
 import math
+import re
 import statistics
 import uuid
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Dict, Iterable, List, MutableMapping, Optional
 
 from .base import BaseDetector
 
+try:  # Optional acceleration; the analyzer must keep working on a stock python3.
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+
+# Fixed-format fast path for the ISO-8601-Z timestamps the app encodes;
+# anything that does not match falls back to datetime.fromisoformat.
+_ISO_RX = re.compile(r"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?Z?")
+
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp_str(value: str) -> float:
+    match = _ISO_RX.fullmatch(value)
+    if match is not None:
+        year, month, day, hour, minute, second, frac = match.groups()
+        month_i, day_i, hour_i, minute_i, second_i = int(month), int(day), int(hour), int(minute), int(second)
+        # timegm silently normalizes out-of-range fields, so bounds-check
+        # before trusting it; oddballs drop through to fromisoformat.
+        if 1 <= month_i <= 12 and 1 <= day_i <= 31 and hour_i < 24 and minute_i < 60 and second_i < 60:
+            seconds = calendar.timegm((int(year), month_i, day_i, hour_i, minute_i, second_i, 0, 0, 0))
+            if frac:
+                return seconds + int(frac.ljust(6, "0")) / 1e6
+            return float(seconds)
+    if value.endswith("Z"):
+        value = value[:-1]
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
+
 
 def _parse_timestamp(value: Any) -> float:
     if isinstance(value, (int, float)):
         return float(value)
     if not isinstance(value, str):
         raise ValueError(f"Unsupported timestamp type: {type(value)}")
-    if value.endswith("Z"):
-        value = value[:-1]
-    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
+    return _parse_timestamp_str(value)
 
 
+@lru_cache(maxsize=4096)
 def _isoformat(ts: float) -> str:
     return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
 
 
+# Interned once and shared by both contribution builders.
+_INCREASE = "increase"
+_DECREASE = "decrease"
+
+
 class MultivariateDetector(BaseDetector):
     """Computes joint anomaly scores across throughput metrics."""
 
@@ -80,33 +115,10 @@ class MultivariateDetector(BaseDetector):
         window_steps = max(5, int(round(window_seconds / sample_interval)))
         threshold = float(self.settings.get("threshold", 3.0))
 
-        evaluations = 0
-        detections: List[Dict[str, Any]] = []
-        for index in range(window_steps, len(times)):
-            history_slice = slice(index - window_steps, index)
-            current_point = {feature: feature_series[feature][index] for feature in usable_features}
-            baseline_stats = self._baseline_stats(feature_series, usable_features, history_slice)
-            if not baseline_stats:
-                continue
-            evaluations += 1
-            z_scores = self._z_scores(current_point, baseline_stats)
-            if not z_scores:
-                continue
-            score = math.sqrt(sum(value**2 for value in z_scores.values()))
-            if score < threshold:
-                continue
-
-            contributions = self._feature_contributions(z_scores)
-            detections.append(
-                {
-                    "id": str(uuid.uuid4()),
-                    "timestamp": _isoformat(times[index]),
-                    "score": score,
-                    "features": {feature: current_point.get(feature) for feature in usable_features},
-                    "zScores": z_scores,
-                    "contributions": contributions,
-                }
-            )
+        if np is not None:
+            evaluations, detections = self._scan_vectorized(times, feature_series, usable_features, window_steps, threshold)
+        else:
+            evaluations, detections = self._scan_python(times, feature_series, usable_features, window_steps, threshold)
 
         diagnostics = self._build_diagnostics(sample_interval, window_steps, evaluations)
         context.multivariate_diagnostics = diagnostics
@@ -166,28 +178,161 @@ class MultivariateDetector(BaseDetector):
     def _estimate_sample_interval(times: List[float]) -> float:
         if len(times) < 2:
             return 0.0
+        if np is not None:
+            # np.median selects via partition in C instead of fully sorting
+            # the N-1 Python floats statistics.median would.
+            diffs_arr = np.diff(np.asarray(times, dtype=np.float64))
+            diffs_arr = diffs_arr[diffs_arr > 0]
+            if diffs_arr.size == 0:
+                return 0.0
+            return float(np.median(diffs_arr))
         diffs = [times[idx + 1] - times[idx] for idx in range(len(times) - 1)]
         diffs = [diff for diff in diffs if diff > 0]
         if not diffs:
             return 0.0
         return statistics.median(diffs)
 
-    def _baseline_stats(
+    def _scan_python(
         self,
+        times: List[float],
         feature_series: Dict[str, List[float]],
         usable_features: List[str],
-        history_slice: slice,
-    ) -> Dict[str, tuple[float, float]]:
-        stats: Dict[str, tuple[float, float]] = {}
+        window_steps: int,
+        threshold: float,
+    ) -> tuple[int, List[Dict[str, Any]]]:
+        """Stock-python scan: running sum / sum-of-squares per feature slide
+        the window in O(1) per step via var = S2/n - (S/n)^2 (clamped at zero
+        against cancellation drift) instead of re-slicing and re-reducing
+        window_steps values for every index."""
+
+        evaluations = 0
+        detections: List[Dict[str, Any]] = []
+        sums: Dict[str, float] = {}
+        sq_sums: Dict[str, float] = {}
         for feature in usable_features:
-            window = feature_series[feature][history_slice]
-            if len(window) < 5:
+            seed = feature_series[feature][:window_steps]
+            sums[feature] = sum(seed)
+            sq_sums[feature] = sum(value * value for value in seed)
+        for index in range(window_steps, len(times)):
+            if index > window_steps:
+                for feature in usable_features:
+                    series = feature_series[feature]
+                    entering = series[index - 1]
+                    leaving = series[index - 1 - window_steps]
+                    sums[feature] += entering - leaving
+                    sq_sums[feature] += entering * entering - leaving * leaving
+            baseline_stats: Dict[str, tuple[float, float]] = {}
+            for feature in usable_features:
+                mean = sums[feature] / window_steps
+                variance = max(0.0, sq_sums[feature] / window_steps - mean * mean)
+                baseline_stats[feature] = (mean, math.sqrt(variance) if variance > 0 else 0.0)
+            current_point = {feature: feature_series[feature][index] for feature in usable_features}
+            evaluations += 1
+            z_scores = self._z_scores(current_point, baseline_stats)
+            if not z_scores:
+                continue
+            score = math.sqrt(sum(value**2 for value in z_scores.values()))
+            if score < threshold:
                 continue
-            mean = statistics.fmean(window)
-            variance = statistics.pvariance(window)
-            std_dev = math.sqrt(variance) if variance > 0 else 0.0
-            stats[feature] = (mean, std_dev)
-        return stats
+
+            contributions = self._feature_contributions(z_scores)
+            detections.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "timestamp": _isoformat(times[index]),
+                    "score": score,
+                    "features": {feature: current_point.get(feature) for feature in usable_features},
+                    "zScores": z_scores,
+                    "contributions": contributions,
+                }
+            )
+        return evaluations, detections
+
+    def _scan_vectorized(
+        self,
+        times: List[float],
+        feature_series: Dict[str, List[float]],
+        usable_features: List[str],
+        window_steps: int,
+        threshold: float,
+    ) -> tuple[int, List[Dict[str, Any]]]:
+        """NumPy scan: rolling mean/std for every (index, feature) cell come
+        from two cumulative sums over the stacked (N, F) matrix, and Python
+        dicts are only materialized for rows that cross the threshold."""
+
+        matrix = np.column_stack([np.asarray(feature_series[feature], dtype=np.float64) for feature in usable_features])
+        n = matrix.shape[0]
+        evaluations = max(0, n - window_steps)
+        if evaluations == 0:
+            return 0, []
+
+        zeros = np.zeros((1, matrix.shape[1]))
+        cs1 = np.vstack((zeros, np.cumsum(matrix, axis=0)))
+        cs2 = np.vstack((zeros, np.cumsum(matrix * matrix, axis=0)))
+        idx = np.arange(window_steps, n)
+        means = (cs1[idx] - cs1[idx - window_steps]) / window_steps
+        variances = np.maximum((cs2[idx] - cs2[idx - window_steps]) / window_steps - means * means, 0.0)
+        stds = np.sqrt(variances)
+
+        # Mirror _z_scores: degenerate windows (collapsed std) contribute a
+        # clamped +/-10 z when the point moved and drop out entirely when it
+        # did not; excluded cells are zeroed so they add nothing to the score.
+        deltas = matrix[idx] - means
+        degenerate = stds <= 1e-9
+        included = ~degenerate | (np.abs(deltas) > 1e-6)
+        z_matrix = np.where(
+            degenerate,
+            np.copysign(10.0, deltas),
+            deltas / np.where(degenerate, 1.0, stds),
+        )
+        z_matrix[~included] = 0.0
+        scores = np.sqrt((z_matrix * z_matrix).sum(axis=1))
+
+        hit_rows = np.flatnonzero((scores >= threshold) & included.any(axis=1))
+        if hit_rows.size == 0:
+            return evaluations, []
+
+        # Contributions for every hit in bulk: normalized |z| weights and the
+        # per-row sort by |z| all happen on the (hits, F) slab, leaving only
+        # dict assembly per survivor. Excluded cells were zeroed above, so
+        # they neither weigh in the totals nor survive the included filter.
+        z_hits = z_matrix[hit_rows]
+        weights = np.abs(z_hits)
+        totals = weights.sum(axis=1, keepdims=True)
+        norm_weights = weights / np.where(totals > 0.0, totals, 1.0)
+        order = np.argsort(-weights, axis=1, kind="stable")
+        # tolist() so the serializers see plain str, not np.str_.
+        direction_rows = np.where(z_hits >= 0, _INCREASE, _DECREASE).tolist()
+
+        detections: List[Dict[str, Any]] = []
+        for pos, row in enumerate(hit_rows):
+            index = int(idx[row])
+            z_scores = {
+                feature: float(z_matrix[row, col])
+                for col, feature in enumerate(usable_features)
+                if included[row, col]
+            }
+            contributions = [
+                {
+                    "feature": usable_features[col],
+                    "weight": float(norm_weights[pos, col]),
+                    "zScore": float(z_hits[pos, col]),
+                    "direction": direction_rows[pos][col],
+                }
+                for col in order[pos]
+                if included[row, col]
+            ]
+            detections.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "timestamp": _isoformat(times[index]),
+                    "score": float(scores[row]),
+                    "features": {feature: feature_series[feature][index] for feature in usable_features},
+                    "zScores": z_scores,
+                    "contributions": contributions,
+                }
+            )
+        return evaluations, detections
 
     @staticmethod
     def _z_scores(
@@ -218,7 +363,7 @@ class MultivariateDetector(BaseDetector):
                 "feature": feature,
                 "weight": weight / total,
                 "zScore": z_scores[feature],
-                "direction": "increase" if z_scores[feature] >= 0 else "decrease",
+                "direction": _INCREASE if z_scores[feature] >= 0 else _DECREASE,
             }
             for feature, weight in weights.items()
         ]
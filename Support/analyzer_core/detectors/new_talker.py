@@ -1,26 +1,19 @@
 from __future__ import annotations
 
+import heapq
 import math
 import uuid
 from collections import defaultdict
-from datetime import datetime, timezone
+from operator import itemgetter
 from typing import Any, Dict, Iterable, List, MutableMapping, Optional
 
 from .base import BaseDetector
+from ._time_utils import isoformat as _isoformat, parse_timestamp as _parse_timestamp
 
-
-def _parse_timestamp(value: Any) -> float:
-    if isinstance(value, (int, float)):
-        return float(value)
-    if not isinstance(value, str):
-        raise ValueError(f"Unsupported timestamp type: {type(value)}")
-    if value.endswith("Z"):
-        value = value[:-1]
-    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
-
-
-def _isoformat(ts: float) -> str:
-    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+try:  # Optional acceleration; the analyzer must keep working on a stock python3.
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
 
 
 class NewTalkerDetector(BaseDetector):
@@ -75,17 +68,26 @@ class NewTalkerDetector(BaseDetector):
 
         new_talkers: List[Dict[str, Any]] = []
         for tag_type, tag_map in entries.items():
-            baseline_entropy = self._entropy([tag.total_bytes for tag in tag_map.values()])
+            if np is not None:
+                # One contiguous array per tag type: the total and the
+                # baseline entropy both come out of vectorized reductions.
+                totals = np.fromiter(
+                    (tag.total_bytes for tag in tag_map.values()), dtype=np.float64, count=len(tag_map)
+                )
+                byte_total = float(totals.sum())
+            else:
+                totals = [tag.total_bytes for tag in tag_map.values()]
+                byte_total = sum(totals)
+            baseline_entropy = self._entropy(totals)
             for tag in tag_map.values():
                 if tag.total_bytes < min_bytes:
                     continue
                 if tag.first_seen < recent_cutoff and tag.unique_windows > 1:
                     continue
-                entropy_without = self._entropy([value.total_bytes for value in tag_map.values() if value.identifier != tag.identifier])
+                entropy_without = self._entropy_without(baseline_entropy, byte_total, tag.total_bytes)
                 delta = baseline_entropy - entropy_without
                 new_talkers.append(
                     {
-                        "id": str(uuid.uuid4()),
                         "tagType": tag_type,
                         "tagValue": tag.identifier,
                         "firstSeen": _isoformat(tag.first_seen),
@@ -96,8 +98,13 @@ class NewTalkerDetector(BaseDetector):
                     }
                 )
 
-        new_talkers.sort(key=lambda item: (item["firstSeen"], -item["totalBytes"]))
-        selected = new_talkers[:max_entries]
+        # Only the top few entries survive; a bounded heap selection is
+        # O(M log K) against the full sort's O(M log M).
+        selected = heapq.nsmallest(max_entries, new_talkers, key=lambda item: (item["firstSeen"], -item["totalBytes"]))
+        # UUIDs draw from the system entropy pool; only the entries that
+        # survive selection need one.
+        for item in selected:
+            item["id"] = str(uuid.uuid4())
 
         diagnostics = self._build_diagnostics(total_seen, len(new_talkers), len(selected))
         context.new_talker_diagnostics = diagnostics
@@ -129,25 +136,34 @@ class NewTalkerDetector(BaseDetector):
     # ---- helper structures -------------------------------------------------
 
     class _TagInfo:
+        __slots__ = ("identifier", "first_seen", "last_seen", "total_bytes", "unique_windows", "_last_window_id")
+
         def __init__(self, identifier: str, first_seen: float) -> None:
             self.identifier = identifier
             self.first_seen = first_seen
             self.last_seen = first_seen
             self.total_bytes = 0.0
             self.unique_windows = 0
-            self.window_ids: set[int] = set()
+            self._last_window_id = -1
 
         def register(self, bytes_value: float, timestamp: float, window_id: int) -> None:
             self.total_bytes += max(0.0, bytes_value)
             self.last_seen = max(self.last_seen, timestamp)
-            if window_id not in self.window_ids:
-                self.window_ids.add(window_id)
+            # Window ids arrive in ascending order (they come from enumerate
+            # over the time-sorted metrics), so remembering the last one seen
+            # is enough to count unique windows - no set needed.
+            if window_id != self._last_window_id:
+                self._last_window_id = window_id
                 self.unique_windows += 1
 
     def _collect_entries(self, metrics: List[MutableMapping[str, Any]]) -> Dict[str, Dict[str, "NewTalkerDetector._TagInfo"]]:
         tag_entries: Dict[str, Dict[str, NewTalkerDetector._TagInfo]] = {tag_type: {} for tag_type in self.TAG_TYPES}
-        for index, metric in enumerate(sorted(metrics, key=lambda item: _parse_timestamp(item.get("timestamp", 0)))):
-            timestamp = _parse_timestamp(metric.get("timestamp"))
+        # Parse each timestamp exactly once: sorting on raw metrics re-parsed
+        # the same string O(log N) times through the sort key and again in the
+        # loop body.
+        parsed = [(_parse_timestamp(metric.get("timestamp")), metric) for metric in metrics]
+        parsed.sort(key=itemgetter(0))
+        for index, (timestamp, metric) in enumerate(parsed):
             tag_metrics = metric.get("tagMetrics") or {}
             if not isinstance(tag_metrics, MutableMapping):
                 continue
@@ -169,6 +185,13 @@ class NewTalkerDetector(BaseDetector):
 
     @staticmethod
     def _entropy(values: Iterable[float]) -> float:
+        if np is not None:
+            arr = np.asarray(values, dtype=np.float64)
+            total = arr.sum()
+            if total <= 0:
+                return 0.0
+            probabilities = arr[arr > 0] / total
+            return float(-(probabilities * np.log2(probabilities)).sum())
         total = sum(values)
         if total <= 0:
             return 0.0
@@ -180,6 +203,24 @@ class NewTalkerDetector(BaseDetector):
             entropy -= probability * math.log2(probability)
         return entropy
 
+    @staticmethod
+    def _entropy_without(baseline_entropy: float, total: float, removed: float) -> float:
+        """Entropy of the byte distribution with one tag taken out.
+
+        Derived algebraically from the baseline instead of rescanning the
+        other tags: with S the total, x the removed bytes and S' = S - x,
+        H' = (S/S')*(H + log2(S'/S)) + (x/S')*log2(x/S').
+        """
+        if removed <= 0.0:
+            # Zero-byte tags never contribute to the entropy sum.
+            return baseline_entropy
+        remaining = total - removed
+        if remaining <= 0.0:
+            return 0.0
+        scale = total / remaining
+        share = removed / remaining
+        return scale * (baseline_entropy + math.log2(remaining / total)) + share * math.log2(removed / remaining)
+
     @staticmethod
     def _build_diagnostics(total_seen: int, detected: int, selected: int) -> Dict[str, Any]:
         return {
@@ -2,30 +2,42 @@ from __future__ import annotations
 
 import math
 import statistics
-from datetime import datetime, timezone
+from operator import itemgetter
 from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Tuple
 
 from .base import BaseDetector
+from ._time_utils import isoformat as _isoformat, parse_timestamp as _parse_timestamp
 
+try:  # Optional acceleration; the analyzer must keep working on a stock python3.
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
 
-def _parse_timestamp(value: Any) -> float:
-    if isinstance(value, (int, float)):
-        return float(value)
-    if not isinstance(value, str):
-        raise ValueError(f"Unsupported timestamp type: {type(value)}")
-    if value.endswith("Z"):
-        value = value[:-1]
-    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
 
+def _pvariance(values: List[float]) -> float:
+    """Population variance through NumPy's single C pass when available."""
 
-def _isoformat(ts: float) -> str:
-    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    if np is not None:
+        return float(np.asarray(values, dtype=np.float64).var())
+    return statistics.pvariance(values)
 
 
 def _seasonal_baseline(series: List[float], period_steps: int) -> Tuple[List[float], List[float]]:
     if period_steps <= 1 or len(series) < period_steps:
         return list(series), [0.0 for _ in series]
 
+    if np is not None:
+        # Per-bucket sums and counts come from two bincounts over the phase
+        # indices, the baseline is a single gather, and the residuals one
+        # array subtraction - no Python-level passes over the series.
+        arr = np.asarray(series, dtype=np.float64)
+        buckets = np.arange(arr.size) % period_steps
+        sums = np.bincount(buckets, weights=arr, minlength=period_steps)
+        counts = np.bincount(buckets, minlength=period_steps)
+        means = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+        baseline_arr = means[buckets]
+        return baseline_arr.tolist(), (arr - baseline_arr).tolist()
+
     seasonal_sums = [0.0] * period_steps
     seasonal_counts = [0] * period_steps
     for idx, value in enumerate(series):
@@ -93,7 +105,7 @@ class SeasonalityDetector(BaseDetector):
             )
             return {}
 
-        chosen_period, diagnostics = self._choose_period(series_map, sample_interval)
+        chosen_period, diagnostics, decompositions = self._choose_period(series_map, sample_interval)
         if chosen_period is None:
             context.add_score(
                 detector="seasonality",
@@ -107,29 +119,38 @@ class SeasonalityDetector(BaseDetector):
         metric_payload: Dict[str, Any] = {}
         confidences: List[float] = []
         band_std_multiplier = float(self.settings.get("bandStdDevs", 2.0))
+        # Format once; every metric's band shares the same timestamps.
+        iso_times = [_isoformat(ts) for ts in times]
 
         for metric_key, label in self.METRIC_KEYS:
             series = series_map.get(metric_key)
-            if not series:
+            # len() rather than truthiness: the series may be an ndarray.
+            if series is None or len(series) == 0:
                 continue
-            baseline, residuals = _seasonal_baseline(series, period_steps)
-            residual_std = math.sqrt(statistics.pvariance(residuals)) if len(residuals) > 1 else 0.0
+            cached = decompositions.get(metric_key)
+            if cached is not None:
+                # _choose_period already decomposed this series with the
+                # winning period; reuse it instead of repeating the pass.
+                baseline, total_var, residual_var = cached
+            else:
+                baseline, residuals = _seasonal_baseline(series, period_steps)
+                total_var = _pvariance(series) if len(series) > 1 else 0.0
+                residual_var = _pvariance(residuals) if len(residuals) > 1 else 0.0
+            residual_std = math.sqrt(residual_var)
             margin = band_std_multiplier * residual_std
-            total_var = statistics.pvariance(series) if len(series) > 1 else 0.0
             explained = 0.0
             if total_var > 0.0:
-                residual_var = statistics.pvariance(residuals) if len(residuals) > 1 else 0.0
                 explained = max(0.0, min(1.0, 1.0 - (residual_var / (total_var + 1e-9))))
             confidences.append(explained)
 
             band = [
                 {
-                    "timestamp": _isoformat(times[idx]),
-                    "baseline": baseline[idx],
-                    "lower": max(0.0, baseline[idx] - margin),
-                    "upper": baseline[idx] + margin,
+                    "timestamp": iso_times[idx],
+                    "baseline": value,
+                    "lower": max(0.0, value - margin),
+                    "upper": value + margin,
                 }
-                for idx in range(len(series))
+                for idx, value in enumerate(baseline)
             ]
 
             metric_payload[metric_key] = {
@@ -169,43 +190,69 @@ class SeasonalityDetector(BaseDetector):
     # ---- helpers ------------------------------------------------------------
 
     def _extract_series(self, metrics: Iterable[MutableMapping[str, Any]]) -> Tuple[List[float], Dict[str, List[float]]]:
-        records: List[Tuple[float, Dict[str, float]]] = []
+        parsed: List[Tuple[float, MutableMapping[str, Any]]] = []
         for entry in metrics:
             try:
                 ts = _parse_timestamp(entry["timestamp"])
             except Exception:
                 continue
-            record: Dict[str, float] = {}
-            for metric_key, _ in self.METRIC_KEYS:
+            parsed.append((ts, entry))
+
+        parsed.sort(key=itemgetter(0))
+        times = [item[0] for item in parsed]
+
+        if np is not None:
+            # Structure-of-arrays: fill one (N, K) matrix in a single pass and
+            # hand out column views, skipping the per-record dicts and the
+            # list-to-array conversions downstream.
+            matrix = np.empty((len(parsed), len(self.METRIC_KEYS)), dtype=np.float64)
+            for row, (_, entry) in enumerate(parsed):
+                for col, (metric_key, _) in enumerate(self.METRIC_KEYS):
+                    try:
+                        matrix[row, col] = float(entry.get(metric_key, 0.0))
+                    except (TypeError, ValueError):
+                        matrix[row, col] = 0.0
+            series_map = {
+                key: matrix[:, col]
+                for col, (key, _) in enumerate(self.METRIC_KEYS)
+                if matrix[:, col].any()
+            }
+            return times, series_map
+
+        columns: Dict[str, List[float]] = {key: [] for key, _ in self.METRIC_KEYS}
+        for _, entry in parsed:
+            for metric_key in columns.keys():
                 try:
-                    record[metric_key] = float(entry.get(metric_key, 0.0))
+                    columns[metric_key].append(float(entry.get(metric_key, 0.0)))
                 except (TypeError, ValueError):
-                    record[metric_key] = 0.0
-            records.append((ts, record))
-
-        records.sort(key=lambda item: item[0])
-        times = [item[0] for item in records]
-
-        series_map: Dict[str, List[float]] = {key: [] for key, _ in self.METRIC_KEYS}
-        for _, record in records:
-            for metric_key in series_map.keys():
-                series_map[metric_key].append(record.get(metric_key, 0.0))
+                    columns[metric_key].append(0.0)
 
-        series_map = {key: values for key, values in series_map.items() if any(values)}
+        series_map = {key: values for key, values in columns.items() if any(values)}
         return times, series_map
 
     @staticmethod
     def _estimate_sample_interval(times: List[float]) -> float:
-        times = sorted(times)
+        # _extract_series already returns times in ascending order, so no
+        # re-sort is needed here.
         if len(times) < 2:
             return 0.0
+        if np is not None:
+            # np.median selects via partition in C instead of fully sorting
+            # the N-1 Python floats statistics.median would.
+            diffs_arr = np.diff(np.asarray(times, dtype=np.float64))
+            diffs_arr = diffs_arr[diffs_arr > 0]
+            if diffs_arr.size == 0:
+                return 0.0
+            return float(np.median(diffs_arr))
         diffs = [times[idx + 1] - times[idx] for idx in range(len(times) - 1)]
         diffs = [diff for diff in diffs if diff > 0]
         if not diffs:
             return 0.0
         return statistics.median(diffs)
 
-    def _choose_period(self, series_map: Dict[str, List[float]], sample_interval: float) -> Tuple[Optional[float], Dict[str, Any]]:
+    def _choose_period(
+        self, series_map: Dict[str, List[float]], sample_interval: float
+    ) -> Tuple[Optional[float], Dict[str, Any], Dict[str, Tuple[List[float], float, float]]]:
         diagnostics: Dict[str, Any] = {
             "candidates": [],
             "selected": None,
@@ -214,6 +261,12 @@ class SeasonalityDetector(BaseDetector):
         min_cycles = float(self.settings.get("minCycles", 2.0))
         best_period: Optional[float] = None
         best_score = -math.inf
+        # Decompositions for the winning candidate, keyed by metric, so
+        # process() does not have to redo the same baseline pass.
+        best_decompositions: Dict[str, Tuple[List[float], float, float]] = {}
+        # The cycles gate depends only on the shortest series; computing that
+        # once keeps the per-candidate check to a single division.
+        min_series_len = min((len(series) for series in series_map.values() if len(series)), default=0)
 
         for raw_period in period_candidates:
             try:
@@ -225,7 +278,7 @@ class SeasonalityDetector(BaseDetector):
             period_steps = int(round(period_seconds / sample_interval))
             if period_steps < 2:
                 continue
-            cycles = min(len(series) / period_steps for series in series_map.values() if series)
+            cycles = min_series_len / period_steps
             if cycles < min_cycles:
                 diagnostics["candidates"].append({
                     "periodSeconds": period_seconds,
@@ -235,12 +288,14 @@ class SeasonalityDetector(BaseDetector):
                 continue
 
             explained_scores: List[float] = []
-            for series in series_map.values():
+            decompositions: Dict[str, Tuple[List[float], float, float]] = {}
+            for metric_key, series in series_map.items():
                 if len(series) < period_steps:
                     continue
                 baseline, residuals = _seasonal_baseline(series, period_steps)
-                total_var = statistics.pvariance(series) if len(series) > 1 else 0.0
-                residual_var = statistics.pvariance(residuals) if len(residuals) > 1 else 0.0
+                total_var = _pvariance(series) if len(series) > 1 else 0.0
+                residual_var = _pvariance(residuals) if len(residuals) > 1 else 0.0
+                decompositions[metric_key] = (baseline, total_var, residual_var)
                 if total_var <= 0.0:
                     continue
                 explained_scores.append(1.0 - (residual_var / (total_var + 1e-9)))
@@ -264,6 +319,7 @@ class SeasonalityDetector(BaseDetector):
             if average_score > best_score:
                 best_score = average_score
                 best_period = period_seconds
+                best_decompositions = decompositions
 
         if best_period is not None:
             diagnostics["selected"] = {
@@ -271,4 +327,4 @@ class SeasonalityDetector(BaseDetector):
                 "explained": best_score,
             }
 
-        return best_period, diagnostics
+        return best_period, diagnostics, best_decompositions
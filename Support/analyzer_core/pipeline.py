@@ -1,13 +1,46 @@
 from __future__ import annotations
 
+import copy
 import json
+import os
+import tempfile
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
 from importlib import import_module
 from pathlib import Path
 import uuid
-from typing import Any, Dict, Iterable, List, MutableMapping, Optional
+from typing import Any, Dict, List, MutableMapping, Optional
+
+try:  # Optional acceleration; the analyzer must keep working on a stock python3.
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+try:  # Optional fast JSON codec; stdlib json remains the fallback.
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(data: Any) -> str:
+        return orjson.dumps(data).decode()
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+try:  # Optional; JSON is valid YAML, so the manifest loads either way.
+    import yaml  # type: ignore
+
+    # libyaml-backed loader when PyYAML was built with it; resolved once at
+    # import instead of per manifest load.
+    _YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+except Exception:  # pragma: no cover - PyYAML is optional
+    yaml = None
+    _YAML_LOADER = None
 
 
 def _default_manifest_path(base_path: Optional[Path]) -> Path:
@@ -15,27 +48,98 @@ def _default_manifest_path(base_path: Optional[Path]) -> Path:
     return root / "analyzer_pipeline.yaml"
 
 
+def _manifest_sidecar_path(path: Path) -> Path:
+    # Pre-parsed JSON cache next to the YAML manifest, e.g.
+    # analyzer_pipeline.yaml.json.
+    return path.with_name(path.name + ".json")
+
+
+def _write_manifest_sidecar(sidecar: Path, data: Dict[str, Any]) -> None:
+    """Best-effort atomic write; the sidecar is purely a parse cache."""
+
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=str(sidecar.parent), prefix=sidecar.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as handle:
+                handle.write(_json_dumps(data))
+            os.replace(tmp_path, sidecar)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        # Read-only install directory or similar - just skip the cache.
+        pass
+
+
 def load_manifest(base_path: Optional[Path] = None) -> Dict[str, Any]:
     """Load the pipeline manifest (YAML or JSON).
 
     Falls back to JSON parsing if PyYAML is unavailable. JSON is valid YAML, so
     the manifest can be written using familiar braces while remaining YAML-compatible.
+
+    Parses are memoized on (path, mtime), so repeated pipeline constructions
+    in one process skip the file read entirely; callers receive a deep copy
+    and may mutate it freely.
     """
 
     path = _default_manifest_path(base_path)
-    if not path.exists():
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
         return {"version": "0", "detectors": []}
+    return copy.deepcopy(_load_manifest_cached(str(path), mtime_ns))
+
 
+@lru_cache(maxsize=8)
+def _load_manifest_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    path = Path(path_str)
     text = path.read_text()
+    if yaml is None:
+        return _json_loads(text or "{}")
+
+    sidecar = _manifest_sidecar_path(path)
+    try:
+        # A sidecar at least as new as the YAML holds the same data and
+        # parses an order of magnitude faster.
+        if sidecar.stat().st_mtime >= path.stat().st_mtime:
+            cached = _json_loads(sidecar.read_text() or "{}")
+            if isinstance(cached, dict):
+                return cached
+    except (OSError, ValueError):
+        pass  # Missing or corrupt sidecar - fall through to the YAML parse.
+
+    data = yaml.load(text, Loader=_YAML_LOADER) or {}
+    if not isinstance(data, dict):
+        raise ValueError("Pipeline manifest must decode to a mapping")
+    _write_manifest_sidecar(sidecar, data)
+    return data
+
+
+# Tests touch manifests in place; give them a handle to drop stale entries.
+load_manifest.cache_clear = _load_manifest_cached.cache_clear  # type: ignore[attr-defined]
+
+
+_UTC = timezone.utc
+
+
+# Module level rather than nested in _ensure_summary: the closures were
+# re-created on every request.
+def _coerce_float(value: Any) -> float:
     try:
-        import yaml  # type: ignore
-    except Exception:
-        return json.loads(text or "{}")
-    else:
-        data = yaml.safe_load(text) or {}
-        if not isinstance(data, dict):
-            raise ValueError("Pipeline manifest must decode to a mapping")
-        return data
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _normalize_timestamp(value: Any) -> str:
+    if isinstance(value, str):
+        # The common case by far - payloads arrive with ISO strings.
+        return value
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(float(value), tz=_UTC).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    if isinstance(value, datetime):
+        return value.astimezone(_UTC).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    return str(value)
 
 
 @dataclass
@@ -50,10 +154,28 @@ class DetectorConfig:
 class PipelineContext:
     """Shared context passed to pipeline detectors."""
 
+    __slots__ = (
+        "result",
+        "component_scores",
+        "reason_codes",
+        "_reason_seen",
+        "seasonality_confidence",
+        "seasonality_payload",
+        "change_points",
+        "change_point_diagnostics",
+        "multivariate_scores",
+        "multivariate_diagnostics",
+        "new_talkers",
+        "new_talker_diagnostics",
+        "alert_events",
+        "alert_config",
+    )
+
     def __init__(self) -> None:
         self.result: Dict[str, Any] = {}
         self.component_scores: List[Dict[str, Any]] = []
         self.reason_codes: List[str] = []
+        self._reason_seen: set[str] = set()
         self.seasonality_confidence: Optional[float] = None
         self.seasonality_payload: Optional[Dict[str, Any]] = None
         self.change_points: List[Dict[str, Any]] = []
@@ -66,78 +188,105 @@ class PipelineContext:
         self.alert_config: Optional[Dict[str, Any]] = None
 
     def merge_partial(self, payload: MutableMapping[str, Any]) -> None:
+        handlers = self._MERGE_HANDLERS
         for key, value in payload.items():
-            if key in {"metrics", "baseline", "anomalies", "clusters"}:
-                existing = self.result.setdefault(key, [])
-                if isinstance(existing, list) and isinstance(value, Iterable):
-                    existing.extend(list(value))
-                else:
-                    self.result[key] = value
-            elif key == "summary":
-                # Later detectors may refine summary; prefer last non-empty value.
-                self.result[key] = value
-            elif key == "settings":
-                settings = self.result.setdefault(key, {})
-                if isinstance(settings, dict) and isinstance(value, MutableMapping):
-                    settings.update(value)
-                else:
-                    self.result[key] = value
-            elif key == "payloadSummary":
-                payload_summary = self.result.setdefault(key, {})
-                if isinstance(payload_summary, dict) and isinstance(value, MutableMapping):
-                    payload_summary.update(value)
-                else:
-                    self.result[key] = value
-            elif key == "seasonality":
-                if isinstance(value, MutableMapping):
-                    self.seasonality_payload = dict(value)
-                self.result[key] = value
-            elif key == "changePoints":
-                if isinstance(value, Iterable):
-                    self.change_points.extend(list(value))
-                elif isinstance(value, MutableMapping):
-                    self.change_points.append(dict(value))
-                self.result[key] = self.change_points
-            elif key == "changePointDiagnostics":
-                if isinstance(value, MutableMapping):
-                    self.change_point_diagnostics = dict(value)
-                self.result[key] = value
-            elif key == "multivariateScores":
-                if isinstance(value, Iterable):
-                    self.multivariate_scores.extend(list(value))
-                elif isinstance(value, MutableMapping):
-                    self.multivariate_scores.append(dict(value))
-                self.result[key] = self.multivariate_scores
-            elif key == "multivariateDiagnostics":
-                if isinstance(value, MutableMapping):
-                    self.multivariate_diagnostics = dict(value)
-                self.result[key] = value
-            elif key == "newTalkers":
-                if isinstance(value, Iterable):
-                    self.new_talkers.extend(list(value))
-                elif isinstance(value, MutableMapping):
-                    self.new_talkers.append(dict(value))
-                self.result[key] = self.new_talkers
-            elif key == "newTalkerDiagnostics":
-                if isinstance(value, MutableMapping):
-                    self.new_talker_diagnostics = dict(value)
+            handler = handlers.get(key)
+            if handler is None:
                 self.result[key] = value
-            elif key == "alerts":
-                if isinstance(value, MutableMapping):
-                    events = value.get("events")
-                    config = value.get("config")
-                    if isinstance(events, Iterable):
-                        self.alert_events.extend(list(events))
-                    if isinstance(config, MutableMapping):
-                        self.alert_config = dict(config)
-                    self.result[key] = {
-                        "events": self.alert_events,
-                        "config": self.alert_config,
-                    }
-                else:
-                    self.result[key] = value
             else:
-                self.result[key] = value
+                handler(self, key, value)
+
+    # ---- merge handlers (dispatched by key, one hash lookup per entry) -----
+
+    def _merge_extend_list(self, key: str, value: Any) -> None:
+        existing = self.result.setdefault(key, [])
+        # Concrete type checks: detector outputs are plain lists, and the
+        # ABC __instancecheck__ for Iterable is far slower per call.
+        if isinstance(existing, list) and isinstance(value, (list, tuple)):
+            # extend() consumes any iterable; no intermediate list copy.
+            existing.extend(value)
+        else:
+            self.result[key] = value
+
+    def _merge_replace(self, key: str, value: Any) -> None:
+        # Later detectors may refine summary; prefer last non-empty value.
+        self.result[key] = value
+
+    def _merge_update_mapping(self, key: str, value: Any) -> None:
+        target = self.result.setdefault(key, {})
+        if isinstance(target, dict) and isinstance(value, MutableMapping):
+            target.update(value)
+        else:
+            self.result[key] = value
+
+    def _merge_seasonality(self, key: str, value: Any) -> None:
+        if isinstance(value, MutableMapping):
+            self.seasonality_payload = dict(value)
+        self.result[key] = value
+
+    def _extend_tracked(self, bucket: List[Dict[str, Any]], key: str, value: Any) -> None:
+        if isinstance(value, (list, tuple)):
+            bucket.extend(value)
+        elif isinstance(value, MutableMapping):
+            bucket.append(dict(value))
+        self.result[key] = bucket
+
+    def _merge_change_points(self, key: str, value: Any) -> None:
+        self._extend_tracked(self.change_points, key, value)
+
+    def _merge_change_point_diagnostics(self, key: str, value: Any) -> None:
+        if isinstance(value, MutableMapping):
+            self.change_point_diagnostics = dict(value)
+        self.result[key] = value
+
+    def _merge_multivariate_scores(self, key: str, value: Any) -> None:
+        self._extend_tracked(self.multivariate_scores, key, value)
+
+    def _merge_multivariate_diagnostics(self, key: str, value: Any) -> None:
+        if isinstance(value, MutableMapping):
+            self.multivariate_diagnostics = dict(value)
+        self.result[key] = value
+
+    def _merge_new_talkers(self, key: str, value: Any) -> None:
+        self._extend_tracked(self.new_talkers, key, value)
+
+    def _merge_new_talker_diagnostics(self, key: str, value: Any) -> None:
+        if isinstance(value, MutableMapping):
+            self.new_talker_diagnostics = dict(value)
+        self.result[key] = value
+
+    def _merge_alerts(self, key: str, value: Any) -> None:
+        if isinstance(value, MutableMapping):
+            events = value.get("events")
+            config = value.get("config")
+            if isinstance(events, (list, tuple)):
+                self.alert_events.extend(events)
+            if isinstance(config, MutableMapping):
+                self.alert_config = dict(config)
+            self.result[key] = {
+                "events": self.alert_events,
+                "config": self.alert_config,
+            }
+        else:
+            self.result[key] = value
+
+    _MERGE_HANDLERS = {
+        "metrics": _merge_extend_list,
+        "baseline": _merge_extend_list,
+        "anomalies": _merge_extend_list,
+        "clusters": _merge_extend_list,
+        "summary": _merge_replace,
+        "settings": _merge_update_mapping,
+        "payloadSummary": _merge_update_mapping,
+        "seasonality": _merge_seasonality,
+        "changePoints": _merge_change_points,
+        "changePointDiagnostics": _merge_change_point_diagnostics,
+        "multivariateScores": _merge_multivariate_scores,
+        "multivariateDiagnostics": _merge_multivariate_diagnostics,
+        "newTalkers": _merge_new_talkers,
+        "newTalkerDiagnostics": _merge_new_talker_diagnostics,
+        "alerts": _merge_alerts,
+    }
 
     def add_score(self, *, detector: str, score: float, weight: Optional[float] = None, label: Optional[str] = None, reasons: Optional[List[str]] = None) -> None:
         entry: Dict[str, Any] = {"detector": detector, "score": float(score)}
@@ -146,8 +295,22 @@ class PipelineContext:
         if label:
             entry["label"] = label
         if reasons:
-            entry["reasonCodes"] = list(dict.fromkeys(reasons))
-            self.reason_codes.extend(entry["reasonCodes"])
+            # One pass handles both dedups: the entry-local ordered set and
+            # the request-global reason_codes list kept unique via
+            # _reason_seen so serialize() never has to rebuild it.
+            deduped: List[str] = []
+            local_seen: set[str] = set()
+            seen = self._reason_seen
+            codes = self.reason_codes
+            for reason in reasons:
+                if reason in local_seen:
+                    continue
+                local_seen.add(reason)
+                deduped.append(reason)
+                if reason not in seen:
+                    seen.add(reason)
+                    codes.append(reason)
+            entry["reasonCodes"] = deduped
         self.component_scores.append(entry)
 
     def set_seasonality_confidence(self, value: Optional[float]) -> None:
@@ -157,11 +320,17 @@ class PipelineContext:
         self.seasonality_payload = dict(payload)
 
     def serialize(self, processing_latency_ms: float) -> Dict[str, Any]:
-        result = dict(self.result)
+        """Finalize the merged result; terminal - mutates and returns it.
+
+        The context is discarded after each request, so copying the result
+        dict first only duplicated every top-level reference.
+        """
+
+        result = self.result
         advanced_detection = {
             "phase": "phase6.6",
             "scores": self.component_scores,
-            "reasonCodes": list(dict.fromkeys(self.reason_codes)),
+            "reasonCodes": list(self.reason_codes),
             "seasonalityConfidence": self.seasonality_confidence,
             "processingLatencyMs": round(processing_latency_ms, 3),
         }
@@ -210,13 +379,36 @@ class PipelineContext:
         return result
 
 
+# Detector classes resolved once per process; repeated pipeline
+# constructions skip the import machinery.
+_DETECTOR_CLASS_CACHE: Dict[tuple[str, str], Optional[type]] = {}
+
+
+def clear_detector_cache() -> None:
+    """Drop memoized detector classes (for tests that reload modules)."""
+
+    _DETECTOR_CLASS_CACHE.clear()
+
+
+# Fully-built pipelines keyed on (manifest path, mtime); see
+# AnalyzerPipeline.load_cached.
+_PIPELINE_CACHE: Dict[tuple[str, int], "AnalyzerPipeline"] = {}
+
+# Placeholder for detector slots that have not been constructed yet
+# (distinct from None, which marks a detector that failed to resolve).
+_DETECTOR_UNLOADED = object()
+
+
 class AnalyzerPipeline:
     """Configurable analyzer pipeline that executes detector stages sequentially."""
 
     def __init__(self, manifest: Dict[str, Any], *, base_path: Optional[Path] = None) -> None:
         self.base_path = base_path or Path(__file__).resolve().parent.parent
         self.manifest = manifest
-        self.detectors: List[tuple[DetectorConfig, Any]] = []
+        # [config, detector, has_settings] slots; detectors are constructed on
+        # first use in process() so stages a deployment disables never pay
+        # import or instantiation cost.
+        self.detectors: List[List[Any]] = []
         for entry in manifest.get("detectors", []) or []:
             if not isinstance(entry, MutableMapping):
                 continue
@@ -229,16 +421,37 @@ class AnalyzerPipeline:
             )
             if not config.enabled:
                 continue
-            detector = self._load_detector(config)
-            if detector is None:
-                continue
-            self.detectors.append((config, detector))
+            self.detectors.append([config, _DETECTOR_UNLOADED, False])
+
+    @classmethod
+    def load_cached(cls, base_path: Optional[Path] = None) -> "AnalyzerPipeline":
+        """Return a pipeline for the manifest under base_path, reusing the
+        previously built instance while the manifest file is unchanged.
+
+        Detectors hold no per-request state (that lives in PipelineContext),
+        so a cached pipeline is safe to share across requests.
+        """
+
+        path = _default_manifest_path(base_path)
+        try:
+            key = (str(path), path.stat().st_mtime_ns)
+        except OSError:
+            key = (str(path), -1)
+        pipeline = _PIPELINE_CACHE.get(key)
+        if pipeline is None:
+            pipeline = cls(load_manifest(base_path), base_path=base_path)
+            _PIPELINE_CACHE[key] = pipeline
+        return pipeline
 
     def _load_detector(self, config: DetectorConfig) -> Optional[Any]:
         if not config.module or not config.cls:
             return None
-        module = import_module(config.module)
-        detector_cls = getattr(module, config.cls, None)
+        key = (config.module, config.cls)
+        try:
+            detector_cls = _DETECTOR_CLASS_CACHE[key]
+        except KeyError:
+            detector_cls = getattr(import_module(config.module), config.cls, None)
+            _DETECTOR_CLASS_CACHE[key] = detector_cls
         if detector_cls is None:
             return None
         return detector_cls(config=config.config, base_path=self.base_path)
@@ -258,13 +471,23 @@ class AnalyzerPipeline:
         else:
             alerts_config = {}
 
-        for config, detector in self.detectors:
+        for slot in self.detectors:
+            config, detector, has_settings = slot
             identifier = config.identifier
             if identifier in disabled_detectors:
                 continue
+            if detector is _DETECTOR_UNLOADED:
+                detector = self._load_detector(config)
+                slot[1] = detector
+                # Probe the settings dict once at construction instead of
+                # hasattr/getattr reflection on every request.
+                has_settings = isinstance(getattr(detector, "settings", None), dict)
+                slot[2] = has_settings
+            if detector is None:
+                continue
             override = param_overrides.get(identifier)
-            if override and hasattr(detector, "settings") and isinstance(getattr(detector, "settings"), dict):
-                detector.settings.update({key: override[key] for key in override.keys()})
+            if override and has_settings:
+                detector.settings.update(override)
             try:
                 partial = detector.process(request, context)
             except Exception as exc:  # pragma: no cover - defensive logging hook
@@ -298,17 +521,27 @@ class AnalyzerPipeline:
         if not isinstance(destinations, list):
             destinations = []
 
+        hits = [
+            (score, entry)
+            for entry in context.component_scores
+            if (score := float(entry.get("score", 0.0))) >= threshold
+        ]
+        if not hits:
+            return
+
+        # Every event in a request shares one timestamp, and one urandom read
+        # covers all the ids instead of a syscall per uuid4() call.
+        now_iso = datetime.now(tz=timezone.utc).isoformat(timespec="milliseconds")
+        random_bytes = os.urandom(16 * len(hits))
+
         events: List[Dict[str, Any]] = []
-        for entry in context.component_scores:
-            score = float(entry.get("score", 0.0))
-            if score < threshold:
-                continue
+        for index, (score, entry) in enumerate(hits):
             detector = entry.get("detector", "detector")
             severity = "critical" if score >= threshold + 0.2 else "warning"
             events.append(
                 {
-                    "id": str(uuid.uuid4()),
-                    "timestamp": datetime.now(tz=timezone.utc).isoformat(timespec="milliseconds"),
+                    "id": str(uuid.UUID(bytes=random_bytes[index * 16:(index + 1) * 16], version=4)),
+                    "timestamp": now_iso,
                     "detector": detector,
                     "score": score,
                     "severity": severity,
@@ -317,28 +550,12 @@ class AnalyzerPipeline:
                 }
             )
 
-        if events:
-            context.alert_events.extend(events)
+        context.alert_events.extend(events)
 
     @staticmethod
     def _ensure_summary(context: PipelineContext, request: Dict[str, Any]) -> None:
         """Backfill summary and minimal metrics so the UI can render partial results."""
 
-        def _coerce_float(value: Any) -> float:
-            try:
-                return float(value)
-            except (TypeError, ValueError):
-                return 0.0
-
-        def _normalize_timestamp(value: Any) -> str:
-            if isinstance(value, str):
-                return value
-            if isinstance(value, (int, float)):
-                return datetime.fromtimestamp(float(value), tz=timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
-            if isinstance(value, datetime):
-                return value.astimezone(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
-            return str(value)
-
         metrics_payload = request.get("metrics") or []
         packets_payload = request.get("packets") or []
 
@@ -350,10 +567,17 @@ class AnalyzerPipeline:
         packets_series: List[float] = []
         flows_series: List[float] = []
 
+        # Whether the backfills are needed is known before the loop, so the
+        # baseline rows can be produced in the same pass as the sanitized
+        # metrics instead of re-iterating them afterwards.
+        need_baseline = "baseline" not in context.result
+        baseline: List[Dict[str, Any]] = []
+
+        _f = _coerce_float  # local alias for the hot loop
         for metric in metrics:
-            bytes_value = _coerce_float(metric.get("bytesPerSecond", 0.0) or 0.0)
-            packets_value = _coerce_float(metric.get("packetsPerSecond", 0.0) or 0.0)
-            flows_value = _coerce_float(metric.get("flowsPerSecond", 0.0) or 0.0)
+            bytes_value = _f(metric.get("bytesPerSecond", 0.0) or 0.0)
+            packets_value = _f(metric.get("packetsPerSecond", 0.0) or 0.0)
+            flows_value = _f(metric.get("flowsPerSecond", 0.0) or 0.0)
 
             hist_payload = metric.get("protocolHistogram") or {}
             histogram: Dict[str, int] = {}
@@ -370,21 +594,25 @@ class AnalyzerPipeline:
                 for tag_type, entries in tags_payload.items():
                     if not isinstance(entries, MutableMapping):
                         continue
-                    sanitized_entries: Dict[str, Dict[str, float]] = {}
-                    for tag_value, stats in entries.items():
-                        if not isinstance(stats, MutableMapping):
-                            continue
-                        sanitized_entries[str(tag_value)] = {
-                            "bytes": _coerce_float(stats.get("bytes", 0.0)),
-                            "packets": _coerce_float(stats.get("packets", 0.0)),
+                    # Payloads are json-decoded, so stats are plain dicts;
+                    # the comprehension keeps the per-entry work in C.
+                    sanitized_entries = {
+                        str(tag_value): {
+                            "bytes": _f(stats.get("bytes", 0.0)),
+                            "packets": _f(stats.get("packets", 0.0)),
                         }
+                        for tag_value, stats in entries.items()
+                        if isinstance(stats, dict)
+                    }
                     if sanitized_entries:
                         tag_metrics[str(tag_type)] = sanitized_entries
 
+            timestamp = _normalize_timestamp(metric.get("timestamp"))
+            window = str(metric.get("window", "perSecond"))
             sanitized_metrics.append(
                 {
-                    "timestamp": _normalize_timestamp(metric.get("timestamp")),
-                    "window": str(metric.get("window", "perSecond")),
+                    "timestamp": timestamp,
+                    "window": window,
                     "bytesPerSecond": bytes_value,
                     "packetsPerSecond": packets_value,
                     "flowsPerSecond": flows_value,
@@ -392,6 +620,18 @@ class AnalyzerPipeline:
                     "tagMetrics": tag_metrics,
                 }
             )
+            if need_baseline:
+                baseline.append(
+                    {
+                        "timestamp": timestamp,
+                        "window": window,
+                        "bytesPerSecond": bytes_value,
+                        "packetsPerSecond": packets_value,
+                        "flowsPerSecond": flows_value,
+                        "protocolHistogram": {},
+                        "tagMetrics": {},
+                    }
+                )
 
             bytes_series.append(bytes_value)
             packets_series.append(packets_value)
@@ -400,19 +640,7 @@ class AnalyzerPipeline:
         if sanitized_metrics and "metrics" not in context.result:
             context.merge_partial({"metrics": sanitized_metrics})
 
-        if sanitized_metrics and "baseline" not in context.result:
-            baseline = [
-                {
-                    "timestamp": entry.get("timestamp"),
-                    "window": entry.get("window", "perSecond"),
-                    "bytesPerSecond": entry.get("bytesPerSecond", 0.0),
-                    "packetsPerSecond": entry.get("packetsPerSecond", 0.0),
-                    "flowsPerSecond": entry.get("flowsPerSecond", 0.0),
-                    "protocolHistogram": {},
-                    "tagMetrics": {},
-                }
-                for entry in sanitized_metrics
-            ]
+        if baseline and need_baseline:
             context.merge_partial({"baseline": baseline})
 
         if "anomalies" not in context.result:
@@ -437,15 +665,27 @@ class AnalyzerPipeline:
 
         total_packets = len(packets)
         total_bytes = 0.0
-        for packet in packets:
-            try:
-                total_bytes += max(0.0, float(packet.get("length", 0.0) or 0.0))
-            except (TypeError, ValueError):
-                continue
+        if packets:
+            if np is not None:
+                lengths = np.fromiter(
+                    (_coerce_float(packet.get("length", 0.0) or 0.0) for packet in packets),
+                    dtype=np.float64,
+                    count=len(packets),
+                )
+                total_bytes = float(np.clip(lengths, 0.0, None).sum())
+            else:
+                for packet in packets:
+                    try:
+                        total_bytes += max(0.0, float(packet.get("length", 0.0) or 0.0))
+                    except (TypeError, ValueError):
+                        continue
 
         def _average(series: List[float]) -> float:
             if not series:
                 return 0.0
+            if np is not None:
+                # One C reduction instead of a Python-level sum.
+                return float(np.asarray(series, dtype=np.float64).mean())
             return float(sum(series) / len(series))
 
         if "summary" not in context.result:
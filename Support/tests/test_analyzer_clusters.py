@@ -10,11 +10,16 @@ SUPPORT_ROOT = Path(__file__).resolve().parents[1]
 if str(SUPPORT_ROOT) not in sys.path:
     sys.path.append(str(SUPPORT_ROOT))
 
+from analyzer_core import AnalyzerPipeline
 from analyzer_core.detectors.legacy import LegacyAnomalyDetector, _isoformat
 
 
 LEGACY = LegacyAnomalyDetector(config={}, base_path=SUPPORT_ROOT)
 
+# In-process pipeline for behavior tests; only the smoke test below pays for
+# a full subprocess round trip through analyzer.py.
+PIPELINE = AnalyzerPipeline.load_cached(base_path=SUPPORT_ROOT)
+
 
 def _ts(offset_seconds: int) -> str:
     base = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
@@ -165,14 +170,7 @@ class ClusterBuilderTests(unittest.TestCase):
             "payloadConfig": {"captureMode": "privileged", "payloadInspectionEnabled": True},
         }
 
-        result = subprocess.run(
-            [sys.executable, str(SUPPORT_ROOT / "analyzer.py")],
-            input=json.dumps(payload),
-            text=True,
-            capture_output=True,
-        )
-        self.assertEqual(result.returncode, 0, msg=result.stderr)
-        output = json.loads(result.stdout or "{}")
+        output = PIPELINE.process(payload)
         summary = output.get("payloadSummary") or {}
         self.assertGreater(summary.get("tlsClientHello", 0), 0)
         self.assertGreater(summary.get("tlsServerHello", 0), 0)
@@ -217,14 +215,7 @@ class ClusterBuilderTests(unittest.TestCase):
             "params": {"windowSeconds": 60, "zThreshold": 2.5, "algorithm": "ewma", "ewmaAlpha": 0.4},
         }
 
-        result = subprocess.run(
-            [sys.executable, str(SUPPORT_ROOT / "analyzer.py")],
-            input=json.dumps(payload),
-            text=True,
-            capture_output=True,
-        )
-        self.assertEqual(result.returncode, 0, msg=result.stderr)
-        output = json.loads(result.stdout or "{}")
+        output = PIPELINE.process(payload)
         settings = output.get("settings") or {}
         self.assertEqual(settings.get("algorithm"), "ewma")
         self.assertAlmostEqual(float(settings.get("ewmaAlpha", 0.0)), 0.4, places=2)